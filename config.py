@@ -22,6 +22,10 @@ class Config:
     WEBHOOK_URL: str = os.getenv("WEBHOOK_URL", "")  # e.g., "https://your-app.onrender.com"
     WEBHOOK_PATH: str = f"/webhook/{BOT_TOKEN}" if BOT_TOKEN else "/webhook"
     WEBHOOK_PORT: int = int(os.getenv("PORT", 10000))  # Render default port
+    # Parallel HTTPS connections Telegram may open to the webhook (Telegram accepts 1-100)
+    WEBHOOK_MAX_CONNECTIONS: int = min(max(int(os.getenv("WEBHOOK_MAX_CONNECTIONS", "100")), 1), 100)
+    # Updates from different users are processed concurrently, at most this many at once
+    MAX_CONCURRENT_UPDATES: int = int(os.getenv("MAX_CONCURRENT_UPDATES", "32"))
 
     # Database Configuration
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./medicine_bot.db")
@@ -55,6 +59,8 @@ class Config:
     # Caregiver Settings
     MAX_CAREGIVERS_PER_USER: int = int(os.getenv("MAX_CAREGIVERS_PER_USER", "5"))
     CAREGIVER_DAILY_REPORT_TIME: str = os.getenv("CAREGIVER_DAILY_REPORT_TIME", "20:00")
+    # Optional hidden chat (e.g. a log channel) used to upload caregiver reports once and copy them out
+    RELAY_CHAT_ID: int = int(os.getenv("RELAY_CHAT_ID", "0"))
 
     # Appointment Settings
     APPOINTMENT_ENABLE: bool = True
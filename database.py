@@ -6,8 +6,8 @@ Using SQLAlchemy 2.0 with modern typing and async support
 import os
 from datetime import datetime, time, timedelta
 from datetime import date
-from typing import List, Optional
-from sqlalchemy import String, Integer, Boolean, DateTime, Time, Text, ForeignKey, Float, select, func, or_  # local import to avoid polluting module top
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import String, Integer, Boolean, DateTime, Time, Text, ForeignKey, Float, select, update, case, func, or_, and_  # local import to avoid polluting module top
 from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from config import config
@@ -214,6 +214,11 @@ engine = create_async_engine(DATABASE_URL, echo=os.getenv("DEBUG", "False").lowe
 async_session = async_sessionmaker(engine, expire_on_commit=False)
 
 
+def _day_range(start_date, end_date) -> Tuple[datetime, datetime]:
+    """Half-open datetime bounds [start 00:00, day after end 00:00) covering whole days, index friendly."""
+    return datetime.combine(start_date, time.min), datetime.combine(end_date + timedelta(days=1), time.min)
+
+
 async def init_database():
     """Initialize the database and create all tables"""
     async with engine.begin() as conn:
@@ -266,6 +271,23 @@ async def init_database():
                 await conn.exec_driver_sql("ALTER TABLE caregivers ADD COLUMN preferred_channel VARCHAR(20) NULL")
         except Exception:
             pass
+        # Index for permission-filtered caregiver lookups
+        try:
+            await conn.exec_driver_sql(
+                "CREATE INDEX IF NOT EXISTS ix_caregivers_user_id_permissions ON caregivers (user_id, permissions)"
+            )
+        except Exception:
+            pass
+        # Composite indexes backing the half-open date range report queries
+        for ddl in (
+            "CREATE INDEX IF NOT EXISTS ix_dose_logs_medicine_id_scheduled_time ON dose_logs (medicine_id, scheduled_time)",
+            "CREATE INDEX IF NOT EXISTS ix_dose_logs_medicine_id_created_at ON dose_logs (medicine_id, created_at)",
+            "CREATE INDEX IF NOT EXISTS ix_symptom_logs_user_id_log_date ON symptom_logs (user_id, log_date)",
+        ):
+            try:
+                await conn.exec_driver_sql(ddl)
+            except Exception:
+                pass
 
 
 async def get_session():
@@ -336,6 +358,20 @@ class DatabaseManager:
             result = await session.execute(stmt)
             return list(result.scalars().all())
 
+    @staticmethod
+    async def user_has_any_tracking(user_id: int) -> bool:
+        """Return True if the user has any medicine or symptom log (cheap EXISTS probe)."""
+        async with async_session() as session:
+            result = await session.execute(
+                select(
+                    or_(
+                        select(Medicine.id).where(Medicine.user_id == user_id).exists(),
+                        select(SymptomLog.id).where(SymptomLog.user_id == user_id).exists(),
+                    )
+                )
+            )
+            return bool(result.scalar())
+
     @staticmethod
     async def get_medicine_by_id(medicine_id: int) -> Optional["Medicine"]:
         """Get medicine by primary key"""
@@ -433,6 +469,35 @@ class DatabaseManager:
             await session.refresh(dose_log)
             return dose_log
 
+    @staticmethod
+    async def record_dose_taken(
+        medicine_id: int, scheduled_time: datetime, taken_at: datetime = None
+    ) -> Optional[Tuple[int, float]]:
+        """Log a taken dose and use up one unit of stock in a single transaction.
+
+        Returns ``(user_id, inventory_count)`` after the update, or None if the medicine does not exist.
+        """
+        if taken_at is None:
+            taken_at = datetime.utcnow()
+        async with async_session() as session:
+            result = await session.execute(
+                update(Medicine)
+                .where(Medicine.id == medicine_id)
+                .values(
+                    inventory_count=case(
+                        (Medicine.inventory_count > 0, Medicine.inventory_count - 1), else_=Medicine.inventory_count
+                    )
+                )
+                .returning(Medicine.user_id, Medicine.inventory_count)
+                .execution_options(synchronize_session=False)
+            )
+            row = result.first()
+            if row is None:
+                return None
+            session.add(DoseLog(medicine_id=medicine_id, scheduled_time=scheduled_time, taken_at=taken_at, status="taken"))
+            await session.commit()
+            return row.user_id, row.inventory_count
+
     @staticmethod
     async def log_dose_skipped(medicine_id: int, scheduled_time: datetime, reason: Optional[str] = None) -> DoseLog:
         """Log that a dose was skipped"""
@@ -469,12 +534,16 @@ class DatabaseManager:
             return list(result.scalars().all())
 
     @staticmethod
-    async def get_user_caregivers(user_id: int, active_only: bool = True) -> List["Caregiver"]:
-        """Get caregivers for a user"""
+    async def get_user_caregivers(
+        user_id: int, active_only: bool = True, permissions: Optional[Sequence[str]] = None
+    ) -> List["Caregiver"]:
+        """Get caregivers for a user, optionally limited to the given permission levels"""
         async with async_session() as session:
             stmt = select(Caregiver).where(Caregiver.user_id == user_id)
             if active_only:
                 stmt = stmt.where(Caregiver.is_active == True)
+            if permissions is not None:
+                stmt = stmt.where(Caregiver.permissions.in_(list(permissions)))
             result = await session.execute(stmt)
             return list(result.scalars().all())
 
@@ -592,16 +661,15 @@ class DatabaseManager:
     @staticmethod
     async def get_medicine_doses_in_range(medicine_id: int, start_date, end_date) -> List["DoseLog"]:
         """Get dose logs for a medicine within a date range (inclusive)."""
+        start_dt, end_dt = _day_range(start_date, end_date)
         async with async_session() as session:
-            start_dt = datetime.combine(start_date, datetime.min.time())
-            end_dt = datetime.combine(end_date, datetime.max.time())
             result = await session.execute(
                 select(DoseLog)
                 .where(
                     DoseLog.medicine_id == medicine_id,
                     or_(
-                        DoseLog.scheduled_time.between(start_dt, end_dt),
-                        DoseLog.created_at.between(start_dt, end_dt),
+                        and_(DoseLog.scheduled_time >= start_dt, DoseLog.scheduled_time < end_dt),
+                        and_(DoseLog.created_at >= start_dt, DoseLog.created_at < end_dt),
                     ),
                 )
                 .order_by(DoseLog.scheduled_time.asc())
@@ -613,22 +681,42 @@ class DatabaseManager:
         user_id: int, start_date, end_date, medicine_id: Optional[int] = None
     ) -> List["SymptomLog"]:
         """Get symptom logs for a user within a date range (inclusive)."""
+        start_dt, end_dt = _day_range(start_date, end_date)
         async with async_session() as session:
             conditions = [
                 SymptomLog.user_id == user_id,
-                SymptomLog.log_date >= datetime.combine(start_date, datetime.min.time()),
-                SymptomLog.log_date <= datetime.combine(end_date, datetime.max.time()),
+                SymptomLog.log_date >= start_dt,
+                SymptomLog.log_date < end_dt,
             ]
             if medicine_id is not None:
                 conditions.append(SymptomLog.medicine_id == medicine_id)
             result = await session.execute(select(SymptomLog).where(*conditions).order_by(SymptomLog.log_date.asc()))
             return list(result.scalars().all())
 
+    @staticmethod
+    async def get_symptom_summary(user_id: int, start_date, end_date) -> dict:
+        """Summarize a user's symptom logs in a date range (inclusive) without loading full rows.
+
+        Returns ``log_count``, ``mood_scores`` (chronological, non-empty only) and ``symptoms`` /
+        ``side_effects`` mappings of each distinct raw entry to the number of logs it appeared in.
+        """
+        start_dt, end_dt = _day_range(start_date, end_date)
+        conditions = [SymptomLog.user_id == user_id, SymptomLog.log_date >= start_dt, SymptomLog.log_date < end_dt]
+        async with async_session() as session:
+            moods = await session.execute(select(SymptomLog.mood_score).where(*conditions).order_by(SymptomLog.log_date.asc()))
+            mood_column = list(moods.scalars().all())
+            summary = {"log_count": len(mood_column), "mood_scores": [m for m in mood_column if m]}
+            for key, column in (("symptoms", SymptomLog.symptoms), ("side_effects", SymptomLog.side_effects)):
+                result = await session.execute(
+                    select(column, func.count()).where(*conditions, column.is_not(None), column != "").group_by(column)
+                )
+                summary[key] = {entry: count for entry, count in result.all()}
+            return summary
+
     @staticmethod
     async def get_doses_for_date(user_id: int, day_date) -> List["DoseLog"]:
         """Get all dose logs for a specific user on a specific date."""
-        day_start = datetime.combine(day_date, datetime.min.time())
-        day_end = datetime.combine(day_date, datetime.max.time())
+        day_start, day_end = _day_range(day_date, day_date)
         async with async_session() as session:
             result = await session.execute(
                 select(DoseLog)
@@ -636,14 +724,58 @@ class DatabaseManager:
                 .where(
                     Medicine.user_id == user_id,
                     or_(
-                        DoseLog.scheduled_time.between(day_start, day_end),
-                        DoseLog.created_at.between(day_start, day_end),
+                        and_(DoseLog.scheduled_time >= day_start, DoseLog.scheduled_time < day_end),
+                        and_(DoseLog.created_at >= day_start, DoseLog.created_at < day_end),
                     ),
                 )
                 .order_by(DoseLog.scheduled_time.asc())
             )
             return list(result.scalars().all())
 
+    @staticmethod
+    async def get_user_doses_in_range(user_id: int, start_date, end_date, status: Optional[str] = None) -> List["DoseLog"]:
+        """Get all dose logs for a user's medicines within a date range (inclusive), optionally for one status."""
+        start_dt, end_dt = _day_range(start_date, end_date)
+        async with async_session() as session:
+            conditions = [
+                Medicine.user_id == user_id,
+                or_(
+                    and_(DoseLog.scheduled_time >= start_dt, DoseLog.scheduled_time < end_dt),
+                    and_(DoseLog.created_at >= start_dt, DoseLog.created_at < end_dt),
+                ),
+            ]
+            if status is not None:
+                conditions.append(DoseLog.status == status)
+            result = await session.execute(
+                select(DoseLog)
+                .join(Medicine, DoseLog.medicine_id == Medicine.id)
+                .where(*conditions)
+                .order_by(DoseLog.scheduled_time.asc())
+            )
+            return list(result.scalars().all())
+
+    @staticmethod
+    async def get_dose_status_counts(user_id: int, start_date, end_date) -> Dict[int, Dict[str, int]]:
+        """Count a user's dose logs per medicine and status within a date range (inclusive)."""
+        start_dt, end_dt = _day_range(start_date, end_date)
+        async with async_session() as session:
+            result = await session.execute(
+                select(DoseLog.medicine_id, DoseLog.status, func.count())
+                .join(Medicine, DoseLog.medicine_id == Medicine.id)
+                .where(
+                    Medicine.user_id == user_id,
+                    or_(
+                        and_(DoseLog.scheduled_time >= start_dt, DoseLog.scheduled_time < end_dt),
+                        and_(DoseLog.created_at >= start_dt, DoseLog.created_at < end_dt),
+                    ),
+                )
+                .group_by(DoseLog.medicine_id, DoseLog.status)
+            )
+            counts: Dict[int, Dict[str, int]] = {}
+            for medicine_id, status, count in result.all():
+                counts.setdefault(medicine_id, {})[status] = count
+            return counts
+
     @staticmethod
     async def create_symptom_log(
         user_id: int,
@@ -899,9 +1031,11 @@ async def _init_mongo():
         await _mongo_db.medicines.create_index([("user_id", 1)])
         await _mongo_db.medicine_schedules.create_index([("medicine_id", 1)])
         await _mongo_db.dose_logs.create_index([("medicine_id", 1), ("scheduled_time", 1)])
+        await _mongo_db.dose_logs.create_index([("medicine_id", 1), ("created_at", 1)])
         await _mongo_db.symptom_logs.create_index([("user_id", 1), ("log_date", 1)])
         await _mongo_db.symptom_logs.create_index([("medicine_id", 1)])
         await _mongo_db.caregivers.create_index([("user_id", 1)])
+        await _mongo_db.caregivers.create_index([("user_id", 1), ("permissions", 1)])
         await _mongo_db.caregivers.create_index([("email", 1)])
         await _mongo_db.caregivers.create_index([("phone", 1)])
         await _mongo_db.appointments.create_index([("user_id", 1), ("when_at", 1)])
@@ -978,15 +1112,14 @@ class DatabaseManagerMongo:
         med_ids = [int(d.get("_id")) for d in med_rows if d.get("_id") is not None]
         if not med_ids:
             return []
-        day_start = datetime.combine(day_date, datetime.min.time())
-        day_end = datetime.combine(day_date, datetime.max.time())
+        day_start, day_end = _day_range(day_date, day_date)
         rows = (
             await _mongo_db.dose_logs.find(
                 {
                     "medicine_id": {"$in": med_ids},
                     "$or": [
-                        {"scheduled_time": {"$gte": day_start, "$lte": day_end}},
-                        {"created_at": {"$gte": day_start, "$lte": day_end}},
+                        {"scheduled_time": {"$gte": day_start, "$lt": day_end}},
+                        {"created_at": {"$gte": day_start, "$lt": day_end}},
                     ],
                 }
             )
@@ -1005,6 +1138,71 @@ class DatabaseManagerMongo:
             result.append(log)
         return result
 
+    @staticmethod
+    async def get_user_doses_in_range(user_id: int, start_date, end_date, status: Optional[str] = None) -> List[DoseLog]:
+        """Return the user's dose logs within a date range (inclusive), optionally for one status (Mongo)."""
+        await _init_mongo()
+        med_rows = await _mongo_db.medicines.find({"user_id": int(user_id)}, {"_id": 1}).to_list(10000)
+        med_ids = [int(d.get("_id")) for d in med_rows if d.get("_id") is not None]
+        if not med_ids:
+            return []
+        start_dt, end_dt = _day_range(start_date, end_date)
+        query = {
+            "medicine_id": {"$in": med_ids},
+            "$or": [
+                {"scheduled_time": {"$gte": start_dt, "$lt": end_dt}},
+                {"created_at": {"$gte": start_dt, "$lt": end_dt}},
+            ],
+        }
+        if status is not None:
+            query["status"] = status
+        rows = await _mongo_db.dose_logs.find(query).sort("scheduled_time", 1).to_list(10000)
+        result: List[DoseLog] = []
+        for d in rows:
+            log = DoseLog()
+            log.id = d.get("_id")
+            log.medicine_id = d.get("medicine_id")
+            log.scheduled_time = d.get("scheduled_time")
+            log.taken_at = d.get("taken_at")
+            log.status = d.get("status", "pending")
+            log.notes = d.get("notes")
+            log.created_at = d.get("created_at")
+            result.append(log)
+        return result
+
+    @staticmethod
+    async def get_dose_status_counts(user_id: int, start_date, end_date) -> Dict[int, Dict[str, int]]:
+        """Count the user's dose logs per medicine and status within a date range (inclusive) (Mongo)."""
+        await _init_mongo()
+        med_rows = await _mongo_db.medicines.find({"user_id": int(user_id)}, {"_id": 1}).to_list(10000)
+        med_ids = [int(d.get("_id")) for d in med_rows if d.get("_id") is not None]
+        if not med_ids:
+            return {}
+        start_dt, end_dt = _day_range(start_date, end_date)
+        pipeline = [
+            {
+                "$match": {
+                    "medicine_id": {"$in": med_ids},
+                    "$or": [
+                        {"scheduled_time": {"$gte": start_dt, "$lt": end_dt}},
+                        {"created_at": {"$gte": start_dt, "$lt": end_dt}},
+                    ],
+                }
+            },
+            {
+                "$group": {
+                    "_id": {"medicine_id": "$medicine_id", "status": {"$ifNull": ["$status", "pending"]}},
+                    "count": {"$sum": 1},
+                }
+            },
+        ]
+        rows = await _mongo_db.dose_logs.aggregate(pipeline).to_list(10000)
+        counts: Dict[int, Dict[str, int]] = {}
+        for row in rows:
+            key = row.get("_id") or {}
+            counts.setdefault(int(key.get("medicine_id")), {})[key.get("status")] = int(row.get("count", 0))
+        return counts
+
     @staticmethod
     async def update_user_timezone(user_id: int, timezone: str) -> bool:
         await _init_mongo()
@@ -1082,6 +1280,13 @@ class DatabaseManagerMongo:
             result.append(m)
         return result
 
+    @staticmethod
+    async def user_has_any_tracking(user_id: int) -> bool:
+        await _init_mongo()
+        if await _mongo_db.medicines.find_one({"user_id": int(user_id)}, {"_id": 1}):
+            return True
+        return bool(await _mongo_db.symptom_logs.find_one({"user_id": int(user_id)}, {"_id": 1}))
+
     @staticmethod
     async def get_medicine_by_id(medicine_id: int) -> Optional[Medicine]:
         await _init_mongo()
@@ -1306,6 +1511,35 @@ class DatabaseManagerMongo:
         log.created_at = doc["created_at"]
         return log
 
+    @staticmethod
+    async def record_dose_taken(
+        medicine_id: int, scheduled_time: datetime, taken_at: datetime = None
+    ) -> Optional[Tuple[int, float]]:
+        await _init_mongo()
+        # Decrement server-side and read back the new count in the same round trip
+        med = await _mongo_db.medicines.find_one_and_update(
+            {"_id": int(medicine_id)},
+            [
+                {
+                    "$set": {
+                        "inventory_count": {
+                            "$cond": [
+                                {"$gt": ["$inventory_count", 0]},
+                                {"$subtract": ["$inventory_count", 1]},
+                                "$inventory_count",
+                            ]
+                        }
+                    }
+                }
+            ],
+            projection={"user_id": 1, "inventory_count": 1},
+            return_document=True,  # ReturnDocument.AFTER
+        )
+        if not med:
+            return None
+        await DatabaseManagerMongo.log_dose_taken(medicine_id, scheduled_time, taken_at)
+        return int(med.get("user_id")), float(med.get("inventory_count", 0))
+
     @staticmethod
     async def log_dose_skipped(medicine_id: int, scheduled_time: datetime, reason: Optional[str] = None) -> DoseLog:
         await _init_mongo()
@@ -1376,11 +1610,15 @@ class DatabaseManagerMongo:
         return result
 
     @staticmethod
-    async def get_user_caregivers(user_id: int, active_only: bool = True) -> List[Caregiver]:
+    async def get_user_caregivers(
+        user_id: int, active_only: bool = True, permissions: Optional[Sequence[str]] = None
+    ) -> List[Caregiver]:
         await _init_mongo()
         q = {"user_id": user_id}
         if active_only:
             q["is_active"] = True
+        if permissions is not None:
+            q["permissions"] = {"$in": list(permissions)}
         rows = await _mongo_db.caregivers.find(q).to_list(100)
         result = []
         for d in rows:
@@ -1543,15 +1781,14 @@ class DatabaseManagerMongo:
     @staticmethod
     async def get_medicine_doses_in_range(medicine_id: int, start_date, end_date) -> List[DoseLog]:
         await _init_mongo()
-        start_dt = datetime.combine(start_date, datetime.min.time())
-        end_dt = datetime.combine(end_date, datetime.max.time())
+        start_dt, end_dt = _day_range(start_date, end_date)
         rows = (
             await _mongo_db.dose_logs.find(
                 {
                     "medicine_id": int(medicine_id),
                     "$or": [
-                        {"scheduled_time": {"$gte": start_dt, "$lte": end_dt}},
-                        {"created_at": {"$gte": start_dt, "$lte": end_dt}},
+                        {"scheduled_time": {"$gte": start_dt, "$lt": end_dt}},
+                        {"created_at": {"$gte": start_dt, "$lt": end_dt}},
                     ],
                 }
             )
@@ -1575,9 +1812,8 @@ class DatabaseManagerMongo:
         user_id: int, start_date, end_date, medicine_id: Optional[int] = None
     ) -> List["SymptomLog"]:
         await _init_mongo()
-        start_dt = datetime.combine(start_date, datetime.min.time())
-        end_dt = datetime.combine(end_date, datetime.max.time())
-        query = {"user_id": int(user_id), "log_date": {"$gte": start_dt, "$lte": end_dt}}
+        start_dt, end_dt = _day_range(start_date, end_date)
+        query = {"user_id": int(user_id), "log_date": {"$gte": start_dt, "$lt": end_dt}}
         if medicine_id is not None:
             query["medicine_id"] = int(medicine_id)
         rows = await _mongo_db.symptom_logs.find(query).sort("log_date", 1).to_list(10000)
@@ -1599,6 +1835,22 @@ class DatabaseManagerMongo:
             result.append(obj)
         return result
 
+    @staticmethod
+    async def get_symptom_summary(user_id: int, start_date, end_date) -> dict:
+        await _init_mongo()
+        start_dt, end_dt = _day_range(start_date, end_date)
+        match = {"user_id": int(user_id), "log_date": {"$gte": start_dt, "$lt": end_dt}}
+        moods = await _mongo_db.symptom_logs.find(match, {"mood_score": 1, "_id": 0}).sort("log_date", 1).to_list(100000)
+        summary = {"log_count": len(moods), "mood_scores": [d.get("mood_score") for d in moods if d.get("mood_score")]}
+        for key in ("symptoms", "side_effects"):
+            pipeline = [
+                {"$match": {**match, key: {"$nin": [None, ""]}}},
+                {"$group": {"_id": f"${key}", "count": {"$sum": 1}}},
+            ]
+            rows = await _mongo_db.symptom_logs.aggregate(pipeline).to_list(100000)
+            summary[key] = {row["_id"]: int(row.get("count", 0)) for row in rows}
+        return summary
+
     @staticmethod
     async def create_symptom_log(
         user_id: int,
@@ -4,6 +4,8 @@ Handlers Package
 All conversation and callback handlers for Medicine Reminder Bot
 """
 
+from functools import lru_cache
+
 from .medicine_handler import MedicineHandler, medicine_handler
 from .reminder_handler import ReminderHandler, reminder_handler
 
@@ -48,7 +50,7 @@ def get_all_handlers():
 
 
 def get_all_conversation_handlers():
-	"""Get all conversation handlers"""
+	"""Get all conversation handlers (built fresh per call: they hold per-chat conversation state)"""
 	conv_handlers = []
 
 	# Medicine handler
@@ -74,8 +76,9 @@ def get_all_conversation_handlers():
 	return conv_handlers
 
 
+@lru_cache(maxsize=1)
 def get_all_callback_handlers():
-	"""Get all callback handlers"""
+	"""Get all callback handlers (stateless, so built once per process and shared)"""
 	callback_handlers = []
 
 	# Reminder handlers
@@ -98,7 +101,7 @@ def get_all_callback_handlers():
 	if reports_handler:
 		callback_handlers.extend(reports_handler.get_handlers())
 
-	return callback_handlers
+	return tuple(callback_handlers)
 
 
 __all__ = [
@@ -13,6 +13,7 @@ from telegram.ext import ContextTypes, ConversationHandler, CommandHandler, Mess
 from config import config
 from database import DatabaseManager, Medicine, MedicineSchedule
 from scheduler import medicine_scheduler
+from handlers.reports_handler import reports_handler
 from utils.time import get_user_timezone_name
 from utils.keyboards import (
     get_medicines_keyboard,
@@ -407,6 +408,7 @@ class MedicineHandler:
                     timezone=get_user_timezone_name(user),
                 )
 
+            reports_handler.invalidate_user_cache(user.id)
             return True
 
         except Exception as e:
@@ -432,7 +434,7 @@ class MedicineHandler:
 
             # Get recent dose history
             recent_doses = await DatabaseManager.get_recent_doses(medicine_id, days=7)
-            taken_count = len([d for d in recent_doses if d.status == "taken"])
+            taken_count = sum(1 for d in recent_doses if d.status == "taken")
             total_count = len(recent_doses)
 
             # Inventory warning
@@ -488,6 +490,7 @@ class MedicineHandler:
 
             # Delete from DB
             ok = await DatabaseManager.delete_medicine(medicine_id)
+            reports_handler.invalidate_user_cache(db_user.id)
             # Show short status and return to main menu (do not reopen medicines list)
             if ok:
                 message = f"{config.EMOJIS['success']} התרופה נמחקה"
@@ -639,6 +642,7 @@ class MedicineHandler:
 
                 # Update inventory
                 await DatabaseManager.update_inventory(medicine_id, new_count)
+                reports_handler.invalidate_user_cache(medicine.user_id)
 
                 status_msg = ""
                 if new_count <= medicine.low_stock_threshold:
@@ -692,6 +696,7 @@ class MedicineHandler:
                 await DatabaseManager.update_inventory(medicine_id, final_count)
 
             medicine = await DatabaseManager.get_medicine_by_id(medicine_id)
+            reports_handler.invalidate_user_cache(medicine.user_id)
             status_msg = ""
             if final_count <= medicine.low_stock_threshold:
                 status_msg = f"\n{config.EMOJIS['warning']} מלאי נמוך!"
@@ -12,6 +12,7 @@ from telegram.ext import ContextTypes, CallbackQueryHandler, CommandHandler
 from config import config
 from database import DatabaseManager, DoseLog
 from scheduler import medicine_scheduler
+from handlers.reports_handler import reports_handler
 from utils.time import get_user_timezone_name, now_in_timezone, ensure_aware
 from utils.keyboards import get_reminder_keyboard, get_main_menu_keyboard, get_confirmation_keyboard, get_cancel_keyboard
 
@@ -69,14 +70,15 @@ class ReminderHandler:
             tz_name = get_user_timezone_name(user)
             now_local = now_in_timezone(tz_name)
             now_utc = datetime.utcnow()
-            dose_log = await DatabaseManager.log_dose_taken(
-                medicine_id=medicine_id, scheduled_time=now_utc, taken_at=now_utc
-            )
+            # Log the dose and use up one unit of stock (never below zero) in a single transaction
+            recorded = await DatabaseManager.record_dose_taken(medicine_id, scheduled_time=now_utc, taken_at=now_utc)
+            if recorded is None:
+                await query.edit_message_text(f"{config.EMOJIS['error']} התרופה או המשתמש לא נמצא")
+                return
+            reports_handler.invalidate_user_cache(user.id)
 
-            # Update inventory (reduce by 1)
             if medicine.inventory_count > 0:
-                new_count = medicine.inventory_count - 1
-                await DatabaseManager.update_inventory(medicine_id, new_count)
+                new_count = recorded[1]
 
                 # Check for low stock
                 low_stock_warning = ""
@@ -222,6 +224,7 @@ class ReminderHandler:
             tz_name = get_user_timezone_name(user)
             now_local = now_in_timezone(tz_name)
             await DatabaseManager.log_dose_skipped(medicine_id=medicine_id, scheduled_time=datetime.utcnow())
+            reports_handler.invalidate_user_cache(user.id)
 
             # Reset reminder attempts
             reminder_key = f"{user.id}_{medicine_id}"
@@ -3,9 +3,17 @@ Reports Handler
 Handles generation and sending of various reports: weekly, monthly, adherence, symptoms
 """
 
+import asyncio
 import logging
+import re
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from dataclasses import dataclass
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional, Tuple
+from statistics import fmean
+from string import Template
+from types import MappingProxyType
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler, CommandHandler, MessageHandler, CallbackQueryHandler, filters
 
@@ -23,6 +31,7 @@ from utils.helpers import (
     generate_summary_stats,
     create_report_filename,
     format_list_hebrew,
+    SimpleCache,
 )
 
 logger = logging.getLogger(__name__)
@@ -31,28 +40,286 @@ logger = logging.getLogger(__name__)
 SELECT_REPORT_TYPE, SELECT_DATE_RANGE, CONFIRM_SEND = range(3)
 
 
+# Symptom entries are free text; tolerate "a,b" and "a , b" as well as "a, b"
+_ENTRY_SEPARATOR = re.compile(r",\s*")
+
+
+def _split_entry_counts(raw_counts: Dict[str, int]) -> Tuple[Counter, int]:
+    """Expand counts of comma-separated log entries into per-item counts, splitting each distinct entry once.
+
+    Returns the per-item counts and the number of logs with an entry, gathered in the same pass.
+    """
+    item_counts: Counter = Counter()
+    log_count = 0
+    for entry, times in raw_counts.items():
+        log_count += times
+        for item in _ENTRY_SEPARATOR.split(entry):
+            item = item.strip()
+            if item:
+                item_counts[item] += times
+    return item_counts, log_count
+
+
+def _clamp_report_start(start_date: date, end_date: date) -> date:
+    """Bound a report range to the last ``_MAX_REPORT_DAYS`` days ending at ``end_date``"""
+    return max(start_date, end_date - timedelta(days=_MAX_REPORT_DAYS))
+
+
+@dataclass(slots=True)
+class _MedStat:
+    """Per-medicine adherence line in the adherence report"""
+
+    name: str
+    taken: int
+    total: int
+    adherence: float
+
+
+# Mood score upper bounds (inclusive) and the emoji shown for each bucket
+_MOOD_THRESHOLDS = (2, 4, 6, 8)
+_MOOD_EMOJIS = ("😩", "😟", "😐", "😊", "😄")
+
+# Minimum change (on the 1-10 mood scale) between early and recent averages to call a trend
+_MOOD_TREND_THRESHOLD = 0.5
+
+# Adherence spread (best - worst day) bounds and the matching stability label
+_STABILITY_THRESHOLDS = (20, 40)
+_STABILITY_LABELS = ("גבוהה", "בינונית", "נמוכה")
+
+# Longest date range any report section will query; wider ranges keep only their most recent days
+_MAX_REPORT_DAYS = 90
+
+# Report inputs (medicine lists, daily adherence) are reused for this many seconds
+_REPORT_CACHE_TTL_SECONDS = 60
+
+# Resolved DB users are reused for this many seconds, for at most this many recently active users
+_USER_CACHE_TTL_SECONDS = 300
+_USER_CACHE_MAX_USERS = 1024
+
+# Report rendering moves to a worker thread only from this many medicines or distinct symptom entries;
+# smaller reports format faster than the thread hand-off costs
+_THREAD_RENDER_MIN_ITEMS = 50
+
+# Telegram's limit for document captions; shorter status messages ride along with the file upload
+_CAPTION_LIMIT = 1024
+
+# Caregiver permission levels that receive report copies
+_REPORT_CAREGIVER_PERMISSIONS = ("view", "manage", "admin")
+
+# Callback patterns, compiled once. Custom reports exclude report_action_* so those buttons reach handle_report_actions
+_REPORTS_MENU_PATTERN = re.compile(r"^reports_menu$")
+_CUSTOM_REPORT_PATTERN = re.compile(r"^report_(?!action_)")
+_REPORT_ACTION_PATTERN = re.compile(r"^report_action_")
+_EXPORT_REPORT_PATTERN = re.compile(r"^export_report_")
+_REPORT_TYPE_PATTERN = re.compile(r"^rtype_")
+_DATE_RANGE_PATTERN = re.compile(r"^range_")
+_SEND_CONFIRM_PATTERN = re.compile(r"^send_confirm_")
+_SEND_CANCEL_PATTERN = re.compile(r"^send_cancel_")
+_CANCEL_PATTERN = re.compile(r"^cancel$")
+
+# Report type and date range labels (read-only, shared by all instances)
+_REPORT_TYPES = MappingProxyType(
+    {
+        "weekly": "דוח שבועי",
+        "monthly": "דוח חודשי",
+        "adherence": "דוח נטילת תרופות",
+        "symptoms": "דוח תופעות לוואי",
+        "full": "דוח מקיף",
+    }
+)
+
+_DATE_RANGES = MappingProxyType(
+    {
+        "last_7_days": "7 ימים אחרונים",
+        "last_14_days": "14 ימים אחרונים",
+        "last_30_days": "30 ימים אחרונים",
+        "last_3_months": "3 חודשים אחרונים",
+        "custom": "תקופה מותאמת אישית",
+    }
+)
+
+# Static messages and keyboards (built once at import; markups are immutable and safe to share)
+_REPORTS_MENU_MESSAGE = f"""
+{config.EMOJIS['report']} <b>מרכז הדוחות</b>
+
+בחרו את סוג הדוח שתרצו ליצור:
+
+📊 <b>דוחות זמינים:</b>
+• דוח שבועי - סיכום 7 ימים אחרונים
+• דוח חודשי - סיכום מקיף של החודש
+• דוח נטילת תרופות - מיקוד בציות לטיפול
+• דוח תופעות לוואי - מעקב תסמינים
+• דוח מקיף - כל המידע במקום אחד
+            """
+
+# Report message templates: static text and emojis are baked in at import, only report data is substituted per call
+_WEEKLY_REPORT_TEMPLATE = Template(f"""
+{config.EMOJIS['report']} <b>דוח שבועי</b>
+📅 $start - $end
+
+$body
+
+{config.EMOJIS['info']} ניתן לשתף דוח זה ידנית עם הרופא/המטפל בלחיצה על "שמור כקובץ".
+            """)
+
+_MONTHLY_REPORT_TEMPLATE = Template(f"""
+{config.EMOJIS['report']} <b>דוח חודשי מקיף</b>
+📅 $start - $end
+
+$body
+
+{config.EMOJIS['info']} דוח זה מתאים להצגה לרופא או למטפל.
+            """)
+
+_CUSTOM_REPORT_TEMPLATE = Template(f"""
+{config.EMOJIS['report']} <b>$title</b>
+📅 $start - $end
+
+$body
+            """)
+
+_DOCTOR_REPORT_TEMPLATE = Template(f"""
+{config.EMOJIS['report']} <b>שליחת דוח לרופא</b>
+הדוח החודשי האחרון מוכן לשליחה. פונקציית שליחה אוטומטית תתווסף בקרוב; בינתיים ניתן להעתיק ולשתף ידנית.
+
+תוכן הדוח:
+
+$body
+            """)
+
+_CAREGIVER_REPORT_TEMPLATE = Template(f"""
+{config.EMOJIS['report']} <b>$title</b>
+👤 <b>מטופל:</b> $patient
+📅 <b>תאריך:</b> $sent_at
+
+$body
+
+{config.EMOJIS['info']} לשיתוף עם מטפל יש להשתמש ב"שלח לרופא" או לשתף ידנית.
+            """)
+
+_REPORTS_MENU_KEYBOARD = InlineKeyboardMarkup(
+    [
+        [
+            InlineKeyboardButton("📅 דוח שבועי", callback_data="report_weekly"),
+            InlineKeyboardButton("📋 דוח מקיף", callback_data="report_full"),
+        ],
+        [InlineKeyboardButton("⚙️ דוחות מתקדמים", callback_data="reports_advanced")],
+        [InlineKeyboardButton(f"{config.EMOJIS['back']} חזור", callback_data="main_menu")],
+    ]
+)
+
+_ADVANCED_REPORTS_MESSAGE = """
+⚙️ <b>דוחות מתקדמים</b>
+
+בחרו דוח ממוקד:
+• דוח נטילת תרופות (ציות לפי תרופה)
+• דוח תופעות לוואי (תסמינים ותופעות נפוצות)
+                """
+
+_ADVANCED_REPORTS_KEYBOARD = InlineKeyboardMarkup(
+    [
+        [InlineKeyboardButton("💊 דוח נטילת תרופות", callback_data="report_adherence")],
+        [InlineKeyboardButton("🩺 דוח תופעות לוואי", callback_data="report_symptoms")],
+        [InlineKeyboardButton(f"{config.EMOJIS['back']} חזרה", callback_data="reports_menu")],
+    ]
+)
+
+_WEEKLY_ACTION_KEYBOARD = InlineKeyboardMarkup(
+    [
+        [
+            InlineKeyboardButton("📧 שלח לרופא", callback_data="report_action_send_doctor"),
+            InlineKeyboardButton("💾 שמור כקובץ", callback_data="export_report_weekly"),
+        ],
+        [InlineKeyboardButton(f"{config.EMOJIS['home']} תפריט ראשי", callback_data="main_menu")],
+    ]
+)
+
+_MONTHLY_ACTION_KEYBOARD = InlineKeyboardMarkup(
+    [
+        [
+            InlineKeyboardButton("📧 שלח לרופא", callback_data="report_action_send_doctor"),
+            InlineKeyboardButton("💾 שמור כקובץ", callback_data="export_report_monthly"),
+        ],
+        [InlineKeyboardButton("📊 דוח מפורט נוסף", callback_data="report_detailed")],
+        [InlineKeyboardButton(f"{config.EMOJIS['home']} תפריט ראשי", callback_data="main_menu")],
+    ]
+)
+
+_CUSTOM_ACTION_KEYBOARD = InlineKeyboardMarkup(
+    [
+        [
+            InlineKeyboardButton("📧 שלח לרופא", callback_data="report_action_send_doctor"),
+            InlineKeyboardButton("💾 שמור כקובץ", callback_data="export_report_custom"),
+        ],
+        [InlineKeyboardButton(f"{config.EMOJIS['home']} תפריט ראשי", callback_data="main_menu")],
+    ]
+)
+
+_HOME_ONLY_KEYBOARD = InlineKeyboardMarkup(
+    [[InlineKeyboardButton(f"{config.EMOJIS['home']} תפריט ראשי", callback_data="main_menu")]]
+)
+
+_NO_DATA_MESSAGE = f"{config.EMOJIS['info']} אין עדיין נתונים לדוח. הוסיפו תרופה או רשמו תופעות לוואי כדי להתחיל."
+
+# Report section texts with their emojis resolved once at import
+_NO_MEDICINES_MESSAGE = f"{config.EMOJIS['info']} אין תרופות רשומות"
+_NO_ADHERENCE_DATA_MESSAGE = f"{config.EMOJIS['info']} אין נתוני נטילה בתקופה זו"
+_NO_SYMPTOMS_DATA_MESSAGE = f"{config.EMOJIS['info']} אין נתוני תופעות לוואי בתקופה זו"
+_NO_TRENDS_DATA_MESSAGE = f"{config.EMOJIS['info']} אין מספיק נתונים לניתוח מגמות"
+_TRENDS_TOO_SHORT_MESSAGE = f"{config.EMOJIS['info']} דרושים לפחות 3 ימים לניתוח מגמות"
+_ADHERENCE_EXCELLENT_NOTE = f"\n{config.EMOJIS['success']} <b>מצוין!</b> שיעור ציות גבוה מאוד."
+_ADHERENCE_GOOD_NOTE = f"\n{config.EMOJIS['warning']} <b>טוב.</b> יש מקום לשיפור קל."
+_ADHERENCE_ATTENTION_NOTE = f"\n{config.EMOJIS['error']} <b>דורש תשומת לב.</b> מומלץ להתייעצות עם הרופא."
+_ADHERENCE_ERROR_MESSAGE = f"{config.EMOJIS['error']} שגיאה ביצירת דוח נטילת תרופות"
+_SYMPTOMS_ERROR_MESSAGE = f"{config.EMOJIS['error']} שגיאה ביצירת דוח תופעות לוואי"
+_INVENTORY_ERROR_MESSAGE = f"{config.EMOJIS['error']} שגיאה ביצירת דוח מלאי"
+_TRENDS_ERROR_MESSAGE = f"{config.EMOJIS['error']} שגיאה ביצירת ניתוח מגמות"
+
+# Status texts for report actions
+_REPORT_SENT_MESSAGE = f"{config.EMOJIS['success']} הדוח נשלח בהצלחה"
+_REPORT_EXPORTED_CAPTION = f"{config.EMOJIS['success']} הדוח נשמר ונשלח כקובץ מצורף"
+_SHARE_FAILED_MESSAGE = f"{config.EMOJIS['error']} שגיאה בשיתוף הדוח"
+_REPORT_CANCELLED_MESSAGE = f"{config.EMOJIS['info']} יצירת הדוח בוטלה"
+_ERROR_PREFIX = config.EMOJIS["error"]
+
+
 class ReportsHandler:
     """Handler for generating and managing reports"""
 
+    # Shared read-only label tables (class-level: one copy per process, not per instance)
+    report_types = _REPORT_TYPES
+    date_ranges = _DATE_RANGES
+
     def __init__(self):
-        self.user_report_data: Dict[int, Dict] = {}
-
-        # Report types
-        self.report_types = {
-            "weekly": "דוח שבועי",
-            "monthly": "דוח חודשי",
-            "adherence": "דוח נטילת תרופות",
-            "symptoms": "דוח תופעות לוואי",
-            "full": "דוח מקיף",
+        # Short-lived per-user cache so back-to-back reports reuse the same DB reads
+        self._report_cache = SimpleCache(default_ttl=_REPORT_CACHE_TTL_SECONDS)
+
+        # DB users by Telegram id, shared with the bot's other handlers through get_db_user
+        self._user_cache = SimpleCache(default_ttl=_USER_CACHE_TTL_SECONDS, max_size=_USER_CACHE_MAX_USERS)
+
+        # Loads currently running, so concurrent identical requests await one shared result
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+
+        # Callback data handled by a dedicated method in start_custom_report
+        self._report_routes = {
+            "report_weekly": self.generate_weekly_report,
+            "report_monthly": self.generate_monthly_report,
+            "report_send_doctor": self.send_to_doctor_flow,
+            "reports_advanced": self._show_advanced_reports,
+            "report_detailed": self._show_advanced_reports,
+        }
+
+        # Single-section custom reports: callback data -> (title, section generator)
+        self._custom_report_sections = {
+            "report_adherence": ("דוח נטילת תרופות (30 ימים)", self._generate_adherence_report),
+            "report_symptoms": ("דוח תופעות לוואי (30 ימים)", self._generate_symptoms_report),
+            "report_full": ("דוח מקיף (30 ימים)", self._generate_custom_full_report),
         }
 
-        # Date range options
-        self.date_ranges = {
-            "last_7_days": "7 ימים אחרונים",
-            "last_14_days": "14 ימים אחרונים",
-            "last_30_days": "30 ימים אחרונים",
-            "last_3_months": "3 חודשים אחרונים",
-            "custom": "תקופה מותאמת אישית",
+        # Report action buttons handled by handle_report_actions
+        self._report_action_routes = {
+            "report_action_send_doctor": self.send_to_doctor_flow,
+            "report_action_share": self._share_last_report,
         }
 
     def get_conversation_handler(self) -> ConversationHandler:
@@ -61,20 +328,20 @@ class ReportsHandler:
             entry_points=[
                 CommandHandler("weekly_report", self.generate_weekly_report),
                 CommandHandler("monthly_report", self.generate_monthly_report),
-                CallbackQueryHandler(self.show_reports_menu, pattern="^reports_menu$"),
-                CallbackQueryHandler(self.start_custom_report, pattern="^report_"),
+                CallbackQueryHandler(self.show_reports_menu, pattern=_REPORTS_MENU_PATTERN),
+                CallbackQueryHandler(self.start_custom_report, pattern=_CUSTOM_REPORT_PATTERN),
             ],
             states={
-                SELECT_REPORT_TYPE: [CallbackQueryHandler(self.handle_report_type_selection, pattern="^rtype_")],
-                SELECT_DATE_RANGE: [CallbackQueryHandler(self.handle_date_range_selection, pattern="^range_")],
+                SELECT_REPORT_TYPE: [CallbackQueryHandler(self.handle_report_type_selection, pattern=_REPORT_TYPE_PATTERN)],
+                SELECT_DATE_RANGE: [CallbackQueryHandler(self.handle_date_range_selection, pattern=_DATE_RANGE_PATTERN)],
                 CONFIRM_SEND: [
-                    CallbackQueryHandler(self.confirm_send_report, pattern="^send_confirm_"),
-                    CallbackQueryHandler(self.cancel_send_report, pattern="^send_cancel_"),
+                    CallbackQueryHandler(self.confirm_send_report, pattern=_SEND_CONFIRM_PATTERN),
+                    CallbackQueryHandler(self.cancel_send_report, pattern=_SEND_CANCEL_PATTERN),
                 ],
             },
             fallbacks=[
                 CommandHandler("cancel", self.cancel_report),
-                CallbackQueryHandler(self.cancel_report, pattern="^cancel$"),
+                CallbackQueryHandler(self.cancel_report, pattern=_CANCEL_PATTERN),
             ],
             per_message=False,
         )
@@ -84,22 +351,26 @@ class ReportsHandler:
         return [
             CommandHandler("generate_report", self.start_custom_report),
             CommandHandler("send_to_doctor", self.send_to_doctor_flow),
-            CallbackQueryHandler(self.show_reports_menu, pattern="^reports_menu$"),
-            CallbackQueryHandler(self.start_custom_report, pattern="^report_"),
-            CallbackQueryHandler(self.handle_report_actions, pattern="^report_action_"),
-            CallbackQueryHandler(self.export_report, pattern="^export_report_"),
+            CallbackQueryHandler(self.show_reports_menu, pattern=_REPORTS_MENU_PATTERN),
+            CallbackQueryHandler(self.start_custom_report, pattern=_CUSTOM_REPORT_PATTERN),
+            CallbackQueryHandler(self.handle_report_actions, pattern=_REPORT_ACTION_PATTERN),
+            CallbackQueryHandler(self.export_report, pattern=_EXPORT_REPORT_PATTERN),
         ]
 
     async def generate_weekly_report(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Generate weekly report"""
         try:
-            user_id = update.effective_user.id
-            user = await DatabaseManager.get_user_by_telegram_id(user_id)
+            user = await self.get_db_user(update.effective_user.id)
 
             if not user:
                 await self._send_error_message(update, "משתמש לא נמצא")
                 return
 
+            # Brand-new users: skip all report queries
+            if not await DatabaseManager.user_has_any_tracking(user.id):
+                await self._send_no_data_message(update)
+                return
+
             # Show loading indication (single message)
             loading_msg = None
             if getattr(update, "callback_query", None):
@@ -112,12 +383,23 @@ class ReportsHandler:
             end_date = date.today()
             start_date = end_date - timedelta(days=7)
 
-            # Generate report
-            report = await self._generate_adherence_report(user.id, start_date, end_date)
-            symptoms_report = await self._generate_symptoms_report(user.id, start_date, end_date)
+            async def build_weekly() -> str:
+                sections = [
+                    asyncio.create_task(self._generate_adherence_report(user.id, start_date, end_date)),
+                    asyncio.create_task(self._generate_symptoms_report(user.id, start_date, end_date)),
+                ]
+                # Show whichever section finishes first while the other is still loading
+                done, pending = await asyncio.wait(sections, return_when=asyncio.FIRST_COMPLETED)
+                first = next(iter(done))
+                if pending and loading_msg and first.exception() is None and first.result():
+                    try:
+                        await loading_msg.edit_text(f"{first.result()}\n\n⏳ ממשיך…", parse_mode="HTML")
+                    except Exception as e:
+                        logger.debug("Could not show partial weekly report: %s", e)
+                return self._combine_reports(await self._gather_sections(*sections))
 
-            # Combine reports
-            full_report = self._combine_reports([report, symptoms_report])
+            # Generate report (repeated taps within the cache TTL reuse the rendered body)
+            full_report = await self._get_cached_report(user.id, "weekly", end_date, build_weekly)
 
             # Cache last report for export/share
             context.user_data["last_report"] = {
@@ -128,63 +410,62 @@ class ReportsHandler:
                 "content": full_report,
             }
 
-            message = f"""
-{config.EMOJIS['report']} <b>דוח שבועי</b>
-📅 {format_date_hebrew(start_date)} - {format_date_hebrew(end_date)}
-
-{full_report}
-
-{config.EMOJIS['info']} ניתן לשתף דוח זה ידנית עם הרופא/המטפל בלחיצה על "שמור כקובץ".
-            """
-
-            keyboard = [
-                [
-                    InlineKeyboardButton("📧 שלח לרופא", callback_data="report_action_send_doctor"),
-                    InlineKeyboardButton("💾 שמור כקובץ", callback_data="export_report_weekly"),
-                ],
-                [InlineKeyboardButton(f"{config.EMOJIS['home']} תפריט ראשי", callback_data="main_menu")],
-            ]
+            message = _WEEKLY_REPORT_TEMPLATE.substitute(
+                start=format_date_hebrew(start_date), end=format_date_hebrew(end_date), body=full_report
+            )
 
             # Replace loading with final content
             if loading_msg:
-                await loading_msg.edit_text(message, parse_mode="HTML", reply_markup=InlineKeyboardMarkup(keyboard))
+                await loading_msg.edit_text(message, parse_mode="HTML", reply_markup=_WEEKLY_ACTION_KEYBOARD)
             else:
                 if update.callback_query:
                     await update.callback_query.edit_message_text(
-                        message, parse_mode="HTML", reply_markup=InlineKeyboardMarkup(keyboard)
+                        message, parse_mode="HTML", reply_markup=_WEEKLY_ACTION_KEYBOARD
                     )
                 elif getattr(update, "message", None):
-                    await update.message.reply_text(message, parse_mode="HTML", reply_markup=InlineKeyboardMarkup(keyboard))
+                    await update.message.reply_text(message, parse_mode="HTML", reply_markup=_WEEKLY_ACTION_KEYBOARD)
 
-            # Send to caregivers
-            await self._send_report_to_caregivers(user.id, "דוח שבועי", full_report, context)
+            # Send to caregivers in the background; the application tracks the task and awaits it on shutdown
+            context.application.create_task(
+                self._send_report_to_caregivers(user.id, "דוח שבועי", full_report, getattr(context, "bot", None), user=user),
+                update=update,
+            )
 
         except Exception as e:
-            logger.error(f"Error generating weekly report: {e}")
+            logger.exception("Error generating weekly report: %s", e)
             await self._send_error_message(update, "שגיאה ביצירת הדוח השבועי")
 
     async def generate_monthly_report(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Generate monthly report"""
         try:
-            user_id = update.effective_user.id
-            user = await DatabaseManager.get_user_by_telegram_id(user_id)
+            user = await self.get_db_user(update.effective_user.id)
 
             if not user:
                 await self._send_error_message(update, "משתמש לא נמצא")
                 return
 
+            # Brand-new users: skip all report queries
+            if not await DatabaseManager.user_has_any_tracking(user.id):
+                await self._send_no_data_message(update)
+                return
+
             # Calculate date range (last 30 days)
             end_date = date.today()
             start_date = end_date - timedelta(days=30)
 
-            # Generate comprehensive report
-            adherence_report = await self._generate_adherence_report(user.id, start_date, end_date)
-            symptoms_report = await self._generate_symptoms_report(user.id, start_date, end_date)
-            inventory_report = await self._generate_inventory_report(user.id)
-            trends_report = await self._generate_trends_report(user.id, start_date, end_date)
+            async def build_monthly() -> str:
+                # Medicines fetched once and shared between sections
+                medicines = await self._get_user_medicines(user.id)
+                sections = await self._gather_sections(
+                    self._generate_adherence_report(user.id, start_date, end_date, medicines=medicines),
+                    self._generate_symptoms_report(user.id, start_date, end_date),
+                    self._generate_inventory_report(user.id, medicines=medicines),
+                    self._generate_trends_report(user.id, start_date, end_date),
+                )
+                return self._combine_reports(sections)
 
-            # Combine all reports
-            full_report = self._combine_reports([adherence_report, symptoms_report, inventory_report, trends_report])
+            # Generate comprehensive report (repeated taps within the cache TTL reuse the rendered body)
+            full_report = await self._get_cached_report(user.id, "monthly", end_date, build_monthly)
 
             # Cache last report for export/share
             context.user_data["last_report"] = {
@@ -195,71 +476,35 @@ class ReportsHandler:
                 "content": full_report,
             }
 
-            message = f"""
-{config.EMOJIS['report']} <b>דוח חודשי מקיף</b>
-📅 {format_date_hebrew(start_date)} - {format_date_hebrew(end_date)}
-
-{full_report}
-
-{config.EMOJIS['info']} דוח זה מתאים להצגה לרופא או למטפל.
-            """
-
-            keyboard = [
-                [
-                    InlineKeyboardButton("📧 שלח לרופא", callback_data="report_action_send_doctor"),
-                    InlineKeyboardButton("💾 שמור כקובץ", callback_data="export_report_monthly"),
-                ],
-                [InlineKeyboardButton("📊 דוח מפורט נוסף", callback_data="report_detailed")],
-                [InlineKeyboardButton(f"{config.EMOJIS['home']} תפריט ראשי", callback_data="main_menu")],
-            ]
+            message = _MONTHLY_REPORT_TEMPLATE.substitute(
+                start=format_date_hebrew(start_date), end=format_date_hebrew(end_date), body=full_report
+            )
 
             if update.callback_query:
                 await update.callback_query.answer()
                 await update.callback_query.edit_message_text(
-                    message, parse_mode="HTML", reply_markup=InlineKeyboardMarkup(keyboard)
+                    message, parse_mode="HTML", reply_markup=_MONTHLY_ACTION_KEYBOARD
                 )
             elif getattr(update, "message", None):
-                await update.message.reply_text(message, parse_mode="HTML", reply_markup=InlineKeyboardMarkup(keyboard))
+                await update.message.reply_text(message, parse_mode="HTML", reply_markup=_MONTHLY_ACTION_KEYBOARD)
 
         except Exception as e:
-            logger.error(f"Error generating monthly report: {e}")
+            logger.exception("Error generating monthly report: %s", e)
             await self._send_error_message(update, "שגיאה ביצירת הדוח החודשי")
 
     async def show_reports_menu(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show reports menu"""
         try:
-            message = f"""
-{config.EMOJIS['report']} <b>מרכז הדוחות</b>
-
-בחרו את סוג הדוח שתרצו ליצור:
-
-📊 <b>דוחות זמינים:</b>
-• דוח שבועי - סיכום 7 ימים אחרונים
-• דוח חודשי - סיכום מקיף של החודש
-• דוח נטילת תרופות - מיקוד בציות לטיפול
-• דוח תופעות לוואי - מעקב תסמינים
-• דוח מקיף - כל המידע במקום אחד
-            """
-
-            keyboard = [
-                [
-                    InlineKeyboardButton("📅 דוח שבועי", callback_data="report_weekly"),
-                    InlineKeyboardButton("📋 דוח מקיף", callback_data="report_full"),
-                ],
-                [InlineKeyboardButton("⚙️ דוחות מתקדמים", callback_data="reports_advanced")],
-                [InlineKeyboardButton(f"{config.EMOJIS['back']} חזור", callback_data="main_menu")],
-            ]
-
             if update.callback_query:
                 await update.callback_query.answer()
                 await update.callback_query.edit_message_text(
-                    message, parse_mode="HTML", reply_markup=InlineKeyboardMarkup(keyboard)
+                    _REPORTS_MENU_MESSAGE, parse_mode="HTML", reply_markup=_REPORTS_MENU_KEYBOARD
                 )
             elif getattr(update, "message", None):
-                await update.message.reply_text(message, parse_mode="HTML", reply_markup=InlineKeyboardMarkup(keyboard))
+                await update.message.reply_text(_REPORTS_MENU_MESSAGE, parse_mode="HTML", reply_markup=_REPORTS_MENU_KEYBOARD)
 
         except Exception as e:
-            logger.error(f"Error showing reports menu: {e}")
+            logger.exception("Error showing reports menu: %s", e)
             await self._send_error_message(update, "שגיאה בהצגת תפריט הדוחות")
 
     async def start_custom_report(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -283,6 +528,18 @@ class ReportsHandler:
                 await self.show_reports_menu(update, context)
                 return ConversationHandler.END
 
+            # Whole-report buttons are routed straight to their generators
+            route = self._report_routes.get(data)
+            if route is not None:
+                await route(update, context)
+                return ConversationHandler.END
+
+            section = self._custom_report_sections.get(data)
+            if section is None:
+                await self.show_reports_menu(update, context)
+                return ConversationHandler.END
+            report_title, generate_section = section
+
             # For heavy reports show loading animation
             loading_msg = None
             if data == "report_full":
@@ -291,63 +548,16 @@ class ReportsHandler:
                 elif getattr(update, "message", None):
                     loading_msg = await update.message.reply_text("⏳ טוען דוח…")
 
-            if data == "report_weekly":
-                # Avoid double-loading: generate directly with the same update
-                return await self.generate_weekly_report(update, context)
-            if data == "report_monthly":
-                await self.generate_monthly_report(update, context)
-                return ConversationHandler.END
-            if data == "report_send_doctor":
-                await self.send_to_doctor_flow(update, context)
-                return ConversationHandler.END
-            if data in ("reports_advanced", "report_detailed"):
-                adv_msg = """
-⚙️ <b>דוחות מתקדמים</b>
-
-בחרו דוח ממוקד:
-• דוח נטילת תרופות (ציות לפי תרופה)
-• דוח תופעות לוואי (תסמינים ותופעות נפוצות)
-                """
-                adv_kb = InlineKeyboardMarkup(
-                    [
-                        [InlineKeyboardButton("💊 דוח נטילת תרופות", callback_data="report_adherence")],
-                        [InlineKeyboardButton("🩺 דוח תופעות לוואי", callback_data="report_symptoms")],
-                        [InlineKeyboardButton(f"{config.EMOJIS['back']} חזרה", callback_data="reports_menu")],
-                    ]
-                )
-                if getattr(update, "callback_query", None):
-                    await update.callback_query.edit_message_text(adv_msg, parse_mode="HTML", reply_markup=adv_kb)
-                else:
-                    await update.message.reply_text(adv_msg, parse_mode="HTML", reply_markup=adv_kb)
-                return ConversationHandler.END
             # Default date range for custom single reports: last 30 days
             end_date = date.today()
             start_date = end_date - timedelta(days=30)
 
-            user_id = update.effective_user.id
-            user = await DatabaseManager.get_user_by_telegram_id(user_id)
+            user = await self.get_db_user(update.effective_user.id)
             if not user:
                 await self._send_error_message(update, "משתמש לא נמצא")
                 return ConversationHandler.END
 
-            report_title = ""
-            report_content = ""
-
-            if data == "report_adherence":
-                report_title = "דוח נטילת תרופות (30 ימים)"
-                report_content = await self._generate_adherence_report(user.id, start_date, end_date)
-            elif data == "report_symptoms":
-                report_title = "דוח תופעות לוואי (30 ימים)"
-                report_content = await self._generate_symptoms_report(user.id, start_date, end_date)
-            elif data == "report_full":
-                report_title = "דוח מקיף (30 ימים)"
-                adherence = await self._generate_adherence_report(user.id, start_date, end_date)
-                symptoms = await self._generate_symptoms_report(user.id, start_date, end_date)
-                trends = await self._generate_trends_report(user.id, start_date, end_date)
-                report_content = self._combine_reports([adherence, symptoms, trends])
-            else:
-                await self.show_reports_menu(update, context)
-                return ConversationHandler.END
+            report_content = await generate_section(user.id, start_date, end_date)
 
             # Cache last report for export/share
             context.user_data["last_report"] = {
@@ -357,36 +567,35 @@ class ReportsHandler:
                 "title": report_title,
                 "content": report_content,
             }
-            message = f"""
-{config.EMOJIS['report']} <b>{report_title}</b>
-📅 {format_date_hebrew(start_date)} - {format_date_hebrew(end_date)}
-
-{report_content}
-            """
-            keyboard = [
-                [
-                    InlineKeyboardButton("📧 שלח לרופא", callback_data="report_action_send_doctor"),
-                    InlineKeyboardButton("💾 שמור כקובץ", callback_data="export_report_custom"),
-                ],
-                [InlineKeyboardButton(f"{config.EMOJIS['home']} תפריט ראשי", callback_data="main_menu")],
-            ]
+            message = _CUSTOM_REPORT_TEMPLATE.substitute(
+                title=report_title, start=format_date_hebrew(start_date), end=format_date_hebrew(end_date), body=report_content
+            )
             if loading_msg:
-                await loading_msg.edit_text(message, parse_mode="HTML", reply_markup=InlineKeyboardMarkup(keyboard))
+                await loading_msg.edit_text(message, parse_mode="HTML", reply_markup=_CUSTOM_ACTION_KEYBOARD)
             else:
                 if callback_query:
-                    await callback_query.edit_message_text(
-                        message, parse_mode="HTML", reply_markup=InlineKeyboardMarkup(keyboard)
-                    )
+                    await callback_query.edit_message_text(message, parse_mode="HTML", reply_markup=_CUSTOM_ACTION_KEYBOARD)
                 else:
                     await update.callback_query.edit_message_text(
-                        message, parse_mode="HTML", reply_markup=InlineKeyboardMarkup(keyboard)
+                        message, parse_mode="HTML", reply_markup=_CUSTOM_ACTION_KEYBOARD
                     )
             return ConversationHandler.END
         except Exception as e:
-            logger.error(f"Error in start_custom_report: {e}")
+            logger.exception("Error in start_custom_report: %s", e)
             await self._send_error_message(update, "שגיאה ביצירת הדוח")
             return ConversationHandler.END
 
+    async def _show_advanced_reports(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Show the advanced reports menu"""
+        if getattr(update, "callback_query", None):
+            await update.callback_query.edit_message_text(
+                _ADVANCED_REPORTS_MESSAGE, parse_mode="HTML", reply_markup=_ADVANCED_REPORTS_KEYBOARD
+            )
+        else:
+            await update.message.reply_text(
+                _ADVANCED_REPORTS_MESSAGE, parse_mode="HTML", reply_markup=_ADVANCED_REPORTS_KEYBOARD
+            )
+
     async def handle_report_type_selection(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Placeholder for report type selection during conversations (not used currently)."""
         try:
@@ -396,7 +605,7 @@ class ReportsHandler:
             await self.show_reports_menu(update, context)
             return ConversationHandler.END
         except Exception as e:
-            logger.error(f"Error in handle_report_type_selection: {e}")
+            logger.exception("Error in handle_report_type_selection: %s", e)
             return ConversationHandler.END
 
     async def handle_date_range_selection(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -407,7 +616,7 @@ class ReportsHandler:
             await self.show_reports_menu(update, context)
             return ConversationHandler.END
         except Exception as e:
-            logger.error(f"Error in handle_date_range_selection: {e}")
+            logger.exception("Error in handle_date_range_selection: %s", e)
             return ConversationHandler.END
 
     async def confirm_send_report(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -415,12 +624,10 @@ class ReportsHandler:
         try:
             if update.callback_query:
                 await update.callback_query.answer()
-                await update.callback_query.edit_message_text(
-                    f"{config.EMOJIS['success']} הדוח נשלח בהצלחה", reply_markup=get_main_menu_keyboard()
-                )
+                await update.callback_query.edit_message_text(_REPORT_SENT_MESSAGE, reply_markup=get_main_menu_keyboard())
             return ConversationHandler.END
         except Exception as e:
-            logger.error(f"Error in confirm_send_report: {e}")
+            logger.exception("Error in confirm_send_report: %s", e)
             return ConversationHandler.END
 
     async def cancel_send_report(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -430,43 +637,37 @@ class ReportsHandler:
     async def send_to_doctor_flow(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Start a minimal flow to send the latest monthly report to a doctor (placeholder)."""
         try:
-            user_id = update.effective_user.id
-            user = await DatabaseManager.get_user_by_telegram_id(user_id)
+            user = await self.get_db_user(update.effective_user.id)
             if not user:
                 await self._send_error_message(update, "משתמש לא נמצא")
                 return ConversationHandler.END
 
             end_date = date.today()
             start_date = end_date - timedelta(days=30)
-            adherence = await self._generate_adherence_report(user.id, start_date, end_date)
-            symptoms = await self._generate_symptoms_report(user.id, start_date, end_date)
-            trends = await self._generate_trends_report(user.id, start_date, end_date)
-            full_report = self._combine_reports([adherence, symptoms, trends])
-
-            message = f"""
-{config.EMOJIS['report']} <b>שליחת דוח לרופא</b>
-הדוח החודשי האחרון מוכן לשליחה. פונקציית שליחה אוטומטית תתווסף בקרוב; בינתיים ניתן להעתיק ולשתף ידנית.
-
-תוכן הדוח:
+            full_report = self._combine_reports(
+                await self._gather_sections(
+                    self._generate_adherence_report(user.id, start_date, end_date),
+                    self._generate_symptoms_report(user.id, start_date, end_date),
+                    self._generate_trends_report(user.id, start_date, end_date),
+                )
+            )
 
-{full_report}
-            """
+            message = _DOCTOR_REPORT_TEMPLATE.substitute(body=full_report)
             # Export as a simple text file placeholder
             filename = create_report_filename("doctor_report", end_date, ext="txt")
             try:
-                # Write plain text with .pdf extension as a placeholder for sharing
-                with open(filename, "w", encoding="utf-8") as f:
-                    f.write(full_report)
-                if update.callback_query:
-                    await update.callback_query.edit_message_text(message, parse_mode="HTML")
-                    await update.callback_query.message.reply_document(
-                        document=open(filename, "rb"), filename=filename, caption="קובץ טקסט לשיתוף עם הרופא"
-                    )
+                # Upload the text straight from memory (no blocking disk I/O or leaked handles)
+                document = full_report.encode("utf-8")
+                target = update.callback_query.message if update.callback_query else update.message
+                if len(message) <= _CAPTION_LIMIT:
+                    # Short message: one upload carries both the text and the file
+                    await target.reply_document(document=document, filename=filename, caption=message, parse_mode="HTML")
                 else:
-                    await update.message.reply_text(message, parse_mode="HTML")
-                    await update.message.reply_document(
-                        document=open(filename, "rb"), filename=filename, caption="קובץ טקסט לשיתוף עם הרופא"
-                    )
+                    if update.callback_query:
+                        await update.callback_query.edit_message_text(message, parse_mode="HTML")
+                    else:
+                        await update.message.reply_text(message, parse_mode="HTML")
+                    await target.reply_document(document=document, filename=filename, caption="קובץ טקסט לשיתוף עם הרופא")
             except Exception:
                 # Fallback: only text
                 if update.callback_query:
@@ -477,7 +678,7 @@ class ReportsHandler:
                     await update.message.reply_text(message, parse_mode="HTML", reply_markup=get_main_menu_keyboard())
             return ConversationHandler.END
         except Exception as e:
-            logger.error(f"Error in send_to_doctor_flow: {e}")
+            logger.exception("Error in send_to_doctor_flow: %s", e)
             await self._send_error_message(update, "שגיאה בשליחת הדוח")
             return ConversationHandler.END
 
@@ -488,33 +689,33 @@ class ReportsHandler:
                 return ConversationHandler.END
             data = update.callback_query.data or ""
             await update.callback_query.answer()
-            if data == "report_action_send_doctor":
-                await self.send_to_doctor_flow(update, context)
-            elif data == "report_action_share":
-                # Send the last generated report as a text file for easy sharing
-                lr = context.user_data.get("last_report", {})
-                content = lr.get("content") or ""
-                title = lr.get("title") or "דוח"
-                end_date = lr.get("end") or date.today()
-                filename = create_report_filename("shared_report", end_date, ext="txt")
-                try:
-                    with open(filename, "w", encoding="utf-8") as f:
-                        f.write(content or title)
-                    await update.callback_query.message.reply_document(
-                        document=open(filename, "rb"), filename=filename, caption="קובץ דוח לשיתוף"
-                    )
-                except Exception as ex:
-                    logger.error(f"Error sharing report file: {ex}")
-                    await update.callback_query.edit_message_text(f"{config.EMOJIS['error']} שגיאה בשיתוף הדוח")
+            action = self._report_action_routes.get(data)
+            if action is not None:
+                await action(update, context)
             else:
                 # Unknown -> back to reports menu
                 await self.show_reports_menu(update, context)
             return ConversationHandler.END
         except Exception as e:
-            logger.error(f"Error in handle_report_actions: {e}")
+            logger.exception("Error in handle_report_actions: %s", e)
             await self._send_error_message(update, "שגיאה בפעולת הדוח")
             return ConversationHandler.END
 
+    async def _share_last_report(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Send the last generated report as a text file for easy sharing"""
+        lr = context.user_data.get("last_report", {})
+        content = lr.get("content") or ""
+        title = lr.get("title") or "דוח"
+        end_date = lr.get("end") or date.today()
+        filename = create_report_filename("shared_report", end_date, ext="txt")
+        try:
+            await update.callback_query.message.reply_document(
+                document=(content or title).encode("utf-8"), filename=filename, caption="קובץ דוח לשיתוף"
+            )
+        except Exception as ex:
+            logger.exception("Error sharing report file: %s", ex)
+            await update.callback_query.edit_message_text(_SHARE_FAILED_MESSAGE)
+
     async def export_report(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Export report placeholder. Will eventually generate and send a file."""
         try:
@@ -528,109 +729,132 @@ class ReportsHandler:
                 text_to_write = content
             else:
                 # Fallback: generate based on the button
-                user_id = update.effective_user.id
-                user = await DatabaseManager.get_user_by_telegram_id(user_id)
+                user = await self.get_db_user(update.effective_user.id)
                 if "weekly" in cb:
                     end_date = date.today()
                     start_date = end_date - timedelta(days=7)
                     content = self._combine_reports(
-                        [
-                            await self._generate_adherence_report(user.id, start_date, end_date),
-                            await self._generate_symptoms_report(user.id, start_date, end_date),
-                        ]
+                        await self._gather_sections(
+                            self._generate_adherence_report(user.id, start_date, end_date),
+                            self._generate_symptoms_report(user.id, start_date, end_date),
+                        )
                     )
                     filename = create_report_filename("weekly_report", end_date, ext="txt")
                     text_to_write = content
                 else:
                     end_date = date.today()
                     start_date = end_date - timedelta(days=30)
-                    content = self._combine_reports(
-                        [
-                            await self._generate_adherence_report(user.id, start_date, end_date),
-                            await self._generate_symptoms_report(user.id, start_date, end_date),
-                            await self._generate_inventory_report(user.id),
-                            await self._generate_trends_report(user.id, start_date, end_date),
-                        ]
-                    )
+                    content = await self._generate_full_report(user.id, start_date, end_date)
                     filename = create_report_filename("full_report", end_date, ext="txt")
                     text_to_write = content
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(text_to_write)
+            document = text_to_write.encode("utf-8")
+            caption = _REPORT_EXPORTED_CAPTION
+            # The status line goes out as the document caption: one upload instead of a message plus an upload
             if update.callback_query:
                 await update.callback_query.answer()
-                await update.callback_query.edit_message_text(
-                    f"{config.EMOJIS['success']} הדוח נשמר ונשלח כקובץ מצורף",
-                    reply_markup=InlineKeyboardMarkup(
-                        [[InlineKeyboardButton(f"{config.EMOJIS['home']} תפריט ראשי", callback_data="main_menu")]]
-                    ),
+                await update.callback_query.message.reply_document(
+                    document=document, filename=filename, caption=caption, reply_markup=_HOME_ONLY_KEYBOARD
                 )
-                await update.callback_query.message.reply_document(document=open(filename, "rb"), filename=filename)
             else:
-                await update.message.reply_text(f"{config.EMOJIS['success']} הדוח נשמר ונשלח כקובץ מצורף")
-                await update.message.reply_document(document=open(filename, "rb"), filename=filename)
+                await update.message.reply_document(document=document, filename=filename, caption=caption)
             return ConversationHandler.END
         except Exception as e:
-            logger.error(f"Error in export_report: {e}")
+            logger.exception("Error in export_report: %s", e)
             await self._send_error_message(update, "שגיאה ביצוא הדוח")
             return ConversationHandler.END
 
-    async def _generate_adherence_report(self, user_id: int, start_date: date, end_date: date) -> str:
+    async def _generate_adherence_report(
+        self, user_id: int, start_date: date, end_date: date, medicines: Optional[List] = None
+    ) -> str:
         """Generate medication adherence report"""
+        start_date = _clamp_report_start(start_date, end_date)
         try:
-            # Get user medicines
-            medicines = await DatabaseManager.get_user_medicines(user_id)
+            # Get user medicines (unless already fetched by the caller)
+            if medicines is None:
+                medicines = await self._get_user_medicines(user_id)
 
             if not medicines:
-                return f"{config.EMOJIS['info']} אין תרופות רשומות"
+                return _NO_MEDICINES_MESSAGE
 
             total_doses = 0
             taken_doses = 0
             missed_doses = 0
             skipped_doses = 0
 
-            medicine_stats = []
+            medicine_stats: List[_MedStat] = []
 
             # Inclusive number of days in range
             num_days = max(0, (end_date - start_date).days + 1)
 
-            for medicine in medicines:
-                # Pull actual logs in range
-                doses = await DatabaseManager.get_medicine_doses_in_range(medicine.id, start_date, end_date)
-                med_taken = len([d for d in doses if getattr(d, "status", None) == "taken"])
-                med_skipped = len([d for d in doses if getattr(d, "status", None) == "skipped"])
+            # Per-medicine status counts for the whole range (aggregated by the database) and active schedules
+            counts_by_medicine, planned_per_day = await asyncio.gather(
+                DatabaseManager.get_dose_status_counts(user_id, start_date, end_date),
+                self._get_planned_per_day(user_id, medicines),
+            )
 
+            for medicine in medicines:
                 # Compute planned total based on active schedules
-                schedules = await DatabaseManager.get_medicine_schedules(medicine.id)
-                planned_per_day = len([s for s in schedules if getattr(s, "is_active", True)])
-                med_total_planned = planned_per_day * num_days if planned_per_day > 0 else 0
+                med_total_planned = planned_per_day[medicine.id] * num_days
+
+                # Only include medicines that have planned doses in this range; skip the counting for the rest
+                if med_total_planned <= 0:
+                    continue
+
+                status_counts = counts_by_medicine.get(medicine.id, {})
+                med_taken = status_counts.get("taken", 0)
+                med_skipped = status_counts.get("skipped", 0)
 
                 # Derive missed as planned minus taken and skipped (never negative)
                 med_missed = max(0, med_total_planned - med_taken - med_skipped)
 
-                # Only include medicines that have planned doses in this range
-                if med_total_planned > 0:
-                    adherence_rate = (med_taken / med_total_planned) * 100 if med_total_planned > 0 else 0.0
-                    medicine_stats.append(
-                        {
-                            "name": medicine.name,
-                            "taken": med_taken,
-                            "total": med_total_planned,
-                            "adherence": adherence_rate,
-                        }
-                    )
+                adherence_rate = (med_taken / med_total_planned) * 100
+                medicine_stats.append(_MedStat(medicine.name, med_taken, med_total_planned, adherence_rate))
 
-                    total_doses += med_total_planned
-                    taken_doses += med_taken
-                    missed_doses += med_missed
-                    skipped_doses += med_skipped
+                total_doses += med_total_planned
+                taken_doses += med_taken
+                missed_doses += med_missed
+                skipped_doses += med_skipped
 
             if total_doses == 0:
-                return f"{config.EMOJIS['info']} אין נתוני נטילה בתקופה זו"
+                return _NO_ADHERENCE_DATA_MESSAGE
+
+            render_args = (medicine_stats, total_doses, taken_doses, skipped_doses, missed_doses)
+            if len(medicine_stats) < _THREAD_RENDER_MIN_ITEMS:
+                return self._render_adherence_report(*render_args)
+            # String assembly is pure CPU work; keep a large one off the event loop
+            return await asyncio.to_thread(self._render_adherence_report, *render_args)
+
+        except Exception as e:
+            logger.exception("Error generating adherence report: %s", e)
+            return _ADHERENCE_ERROR_MESSAGE
 
-            overall_adherence = (taken_doses / total_doses) * 100
+    async def _generate_symptoms_report(self, user_id: int, start_date: date, end_date: date) -> str:
+        """Generate symptoms and side effects report"""
+        start_date = _clamp_report_start(start_date, end_date)
+        try:
+            # Mood scores and per-entry counts are aggregated by the database
+            summary = await DatabaseManager.get_symptom_summary(user_id, start_date, end_date)
+
+            if not summary["log_count"]:
+                return _NO_SYMPTOMS_DATA_MESSAGE
+
+            if len(summary["symptoms"]) + len(summary["side_effects"]) < _THREAD_RENDER_MIN_ITEMS:
+                return self._render_symptoms_report(summary)
+            # Splitting, counting and formatting are pure CPU work; keep a large batch off the event loop
+            return await asyncio.to_thread(self._render_symptoms_report, summary)
+
+        except Exception as e:
+            logger.exception("Error generating symptoms report: %s", e)
+            return _SYMPTOMS_ERROR_MESSAGE
 
-            # Create report
-            report = f"""
+    def _render_adherence_report(
+        self, medicine_stats: List[_MedStat], total_doses: int, taken_doses: int, skipped_doses: int, missed_doses: int
+    ) -> str:
+        """Format the adherence report from precomputed totals (sync; many medicines run in a worker thread)"""
+        overall_adherence = (taken_doses / total_doses) * 100
+
+        # Create report
+        parts: List[str] = [f"""
 💊 <b>דוח נטילת תרופות</b>
 
 📊 <b>סיכום כללי:</b>
@@ -642,171 +866,153 @@ class ReportsHandler:
 🎯 <b>שיעור ציות כללי:</b> {create_progress_bar(taken_doses, total_doses, 10, 'emoji')} {overall_adherence:.1f}%
 
 📋 <b>פירוט לפי תרופה:</b>
-"""
-
-            for stat in medicine_stats:
-                progress_bar = create_progress_bar(stat["taken"], stat["total"], 8, 'emoji')
-                report += f"• <b>{stat['name']}:</b> {progress_bar} {stat['adherence']:.1f}%\n"
-
-            # Add recommendations
-            if overall_adherence >= 90:
-                report += f"\n{config.EMOJIS['success']} <b>מצוין!</b> שיעור ציות גבוה מאוד."
-            elif overall_adherence >= 80:
-                report += f"\n{config.EMOJIS['warning']} <b>טוב.</b> יש מקום לשיפור קל."
-            else:
-                report += f"\n{config.EMOJIS['error']} <b>דורש תשומת לב.</b> מומלץ להתייעצות עם הרופא."
-
-            return report
-
-        except Exception as e:
-            logger.error(f"Error generating adherence report: {e}")
-            return f"{config.EMOJIS['error']} שגיאה ביצירת דוח נטילת תרופות"
-
-    async def _generate_symptoms_report(self, user_id: int, start_date: date, end_date: date) -> str:
-        """Generate symptoms and side effects report"""
-        try:
-            # Get symptom logs in date range
-            symptom_logs = await DatabaseManager.get_symptom_logs_in_range(user_id, start_date, end_date)
-
-            if not symptom_logs:
-                return f"{config.EMOJIS['info']} אין נתוני תופעות לוואי בתקופה זו"
-
-            # Calculate statistics
-            mood_scores = [log.mood_score for log in symptom_logs if log.mood_score]
-            avg_mood = sum(mood_scores) / len(mood_scores) if mood_scores else 0
+"""]
 
-            symptoms_days = len([log for log in symptom_logs if log.symptoms])
-            side_effects_days = len([log for log in symptom_logs if log.side_effects])
+        for stat in medicine_stats:
+            progress_bar = create_progress_bar(stat.taken, stat.total, 8, "emoji")
+            parts.append(f"• <b>{stat.name}:</b> {progress_bar} {stat.adherence:.1f}%\n")
 
-            # Common symptoms analysis
-            all_symptoms = []
-            all_side_effects = []
+        # Add recommendations
+        if overall_adherence >= 90:
+            parts.append(_ADHERENCE_EXCELLENT_NOTE)
+        elif overall_adherence >= 80:
+            parts.append(_ADHERENCE_GOOD_NOTE)
+        else:
+            parts.append(_ADHERENCE_ATTENTION_NOTE)
 
-            for log in symptom_logs:
-                if log.symptoms:
-                    all_symptoms.extend(log.symptoms.split(", "))
-                if log.side_effects:
-                    all_side_effects.extend(log.side_effects.split(", "))
+        return "".join(parts)
 
-            # Count frequency
-            from collections import Counter
+    def _render_symptoms_report(self, summary: dict) -> str:
+        """Format the symptoms report from a symptom summary (sync; large summaries run in a worker thread)"""
+        mood_scores = summary["mood_scores"]
+        symptom_counts, symptoms_days = _split_entry_counts(summary["symptoms"])
+        side_effect_counts, side_effects_days = _split_entry_counts(summary["side_effects"])
 
-            common_symptoms = Counter(all_symptoms).most_common(5)
-            common_side_effects = Counter(all_side_effects).most_common(5)
+        avg_mood = fmean(mood_scores) if mood_scores else 0
+        common_symptoms = symptom_counts.most_common(5)
+        common_side_effects = side_effect_counts.most_common(5)
 
-            report = f"""
+        parts: List[str] = [f"""
 🩺 <b>דוח תופעות לוואי ותסמינים</b>
 
 📊 <b>סיכום כללי:</b>
-• ימים עם רישומים: {len(symptom_logs)}
+• ימים עם רישומים: {summary['log_count']}
 • ממוצע מצב רוח: {avg_mood:.1f}/10 {self._get_mood_emoji(avg_mood)}
 • ימים עם תסמינים: {symptoms_days}
 • ימים עם תופעות לוואי: {side_effects_days}
-"""
+"""]
 
-            if common_symptoms:
-                report += "\n🤒 <b>תסמינים נפוצים:</b>\n"
-                for symptom, count in common_symptoms:
-                    report += f"• {symptom}: {count} פעמים\n"
+        if common_symptoms:
+            parts.append("\n🤒 <b>תסמינים נפוצים:</b>\n")
+            parts.extend(f"• {symptom}: {count} פעמים\n" for symptom, count in common_symptoms)
 
-            if common_side_effects:
-                report += "\n💊 <b>תופעות לוואי נפוצות:</b>\n"
-                for side_effect, count in common_side_effects:
-                    report += f"• {side_effect}: {count} פעמים\n"
+        if common_side_effects:
+            parts.append("\n💊 <b>תופעות לוואי נפוצות:</b>\n")
+            parts.extend(f"• {side_effect}: {count} פעמים\n" for side_effect, count in common_side_effects)
 
-            # Mood trend
-            if len(mood_scores) > 1:
-                recent_mood = sum(mood_scores[-3:]) / len(mood_scores[-3:])
-                early_mood = sum(mood_scores[:3]) / len(mood_scores[:3])
-                trend = "עולה" if recent_mood > early_mood + 5 else "מתדרדרת" if recent_mood < early_mood - 5 else "יציבה"
-                report += f"\n📈 **מגמת מצב רוח:** {trend}"
+        # Mood trend
+        if len(mood_scores) > 1:
+            delta = fmean(mood_scores[-3:]) - fmean(mood_scores[:3])
+            trend = "עולה" if delta > _MOOD_TREND_THRESHOLD else "מתדרדרת" if delta < -_MOOD_TREND_THRESHOLD else "יציבה"
+            parts.append(f"\n📈 **מגמת מצב רוח:** {trend}")
 
-            return report
+        return "".join(parts)
 
-        except Exception as e:
-            logger.error(f"Error generating symptoms report: {e}")
-            return f"{config.EMOJIS['error']} שגיאה ביצירת דוח תופעות לוואי"
-
-    async def _generate_inventory_report(self, user_id: int) -> str:
+    async def _generate_inventory_report(self, user_id: int, medicines: Optional[List] = None) -> str:
         """Generate inventory status report"""
         try:
-            medicines = await DatabaseManager.get_user_medicines(user_id)
+            if medicines is None:
+                medicines = await self._get_user_medicines(user_id)
 
             if not medicines:
-                return f"{config.EMOJIS['info']} אין תרופות רשומות"
+                return _NO_MEDICINES_MESSAGE
+
+            # Reuse the last rendering while the stock snapshot is unchanged
+            cache_key = f"inventory:{user_id}"
+            # Read each medicine's stock fields once; missing values count as zero instead of failing comparisons
+            stock_rows = [(m, m.inventory_count or 0, m.low_stock_threshold or 0) for m in medicines]
+            snapshot = tuple((m.id, count, threshold) for m, count, threshold in stock_rows)
+            cached = self._report_cache.get(cache_key)
+            if cached is not None and cached[0] == snapshot:
+                return cached[1]
 
             low_stock = []
             out_of_stock = []
-            good_stock = []
+            # Healthy stock is only previewed, so keep a count and the first few instead of the whole list
+            good_count = 0
+            good_preview = []
 
-            for medicine in medicines:
-                if medicine.inventory_count <= 0:
+            for medicine, count, threshold in stock_rows:
+                if count <= 0:
                     out_of_stock.append(medicine)
-                elif medicine.inventory_count <= medicine.low_stock_threshold:
-                    low_stock.append(medicine)
+                elif count <= threshold:
+                    low_stock.append((medicine, count))
                 else:
-                    good_stock.append(medicine)
+                    good_count += 1
+                    if good_count <= 5:
+                        good_preview.append((medicine, count))
 
-            report = f"""
+            parts: List[str] = [f"""
 📦 <b>דוח מצב מלאי</b>
 
 📊 <b>סיכום:</b>
 • סה"כ תרופות: {len(medicines)}
-• מלאי טוב: {len(good_stock)}
+• מלאי טוב: {good_count}
 • מלאי נמוך: {len(low_stock)}
 • נגמר: {len(out_of_stock)}
-"""
+"""]
 
             if out_of_stock:
-                report += "\n🚨 **תרופות שנגמרו (דורש הזמנה דחופה):**\n"
-                for medicine in out_of_stock:
-                    report += f"• {medicine.name}\n"
+                parts.append("\n🚨 **תרופות שנגמרו (דורש הזמנה דחופה):**\n")
+                parts.extend(f"• {medicine.name}\n" for medicine in out_of_stock)
 
             if low_stock:
-                report += "\n⚠️ **מלאי נמוך (מומלץ להזמין):**\n"
-                for medicine in low_stock:
-                    report += f"• {medicine.name}: {medicine.inventory_count} כדורים\n"
+                parts.append("\n⚠️ **מלאי נמוך (מומלץ להזמין):**\n")
+                parts.extend(f"• {medicine.name}: {count} כדורים\n" for medicine, count in low_stock)
 
-            if good_stock:
-                report += "\n✅ **מלאי תקין:**\n"
-                for medicine in good_stock[:5]:  # Show first 5
-                    report += f"• {medicine.name}: {medicine.inventory_count} כדורים\n"
+            if good_preview:
+                parts.append("\n✅ **מלאי תקין:**\n")
+                parts.extend(f"• {medicine.name}: {count} כדורים\n" for medicine, count in good_preview)
 
-                if len(good_stock) > 5:
-                    report += f"ועוד {len(good_stock) - 5} תרופות...\n"
+                if good_count > len(good_preview):
+                    parts.append(f"ועוד {good_count - len(good_preview)} תרופות...\n")
 
+            report = "".join(parts)
+            self._report_cache.set(cache_key, (snapshot, report))
             return report
 
         except Exception as e:
-            logger.error(f"Error generating inventory report: {e}")
-            return f"{config.EMOJIS['error']} שגיאה ביצירת דוח מלאי"
+            logger.exception("Error generating inventory report: %s", e)
+            return _INVENTORY_ERROR_MESSAGE
 
     async def _generate_trends_report(self, user_id: int, start_date: date, end_date: date) -> str:
         """Generate trends analysis report"""
+        start_date = _clamp_report_start(start_date, end_date)
         try:
             # Get adherence data over time (recalculate using schedules for accuracy)
             daily_adherence = await self._calculate_daily_adherence(user_id, start_date, end_date)
 
             if not daily_adherence:
-                return f"{config.EMOJIS['info']} אין מספיק נתונים לניתוח מגמות"
+                return _NO_TRENDS_DATA_MESSAGE
 
             # Calculate trends
             rates = list(daily_adherence.values())
 
             if len(rates) < 3:
-                return f"{config.EMOJIS['info']} דרושים לפחות 3 ימים לניתוח מגמות"
+                return _TRENDS_TOO_SHORT_MESSAGE
 
             # Simple trend analysis
-            recent_avg = sum(rates[-3:]) / 3
-            early_avg = sum(rates[:3]) / 3
+            recent_avg = fmean(rates[-3:])
+            early_avg = fmean(rates[:3])
 
             trend_direction = "משתפרת" if recent_avg > early_avg + 5 else "מתדרדרת" if recent_avg < early_avg - 5 else "יציבה"
 
-            # Best and worst days
+            # Best and worst days (single scan each; spread reused for stability)
             best_rate = max(rates)
             worst_rate = min(rates)
+            stability = _STABILITY_LABELS[bisect_right(_STABILITY_THRESHOLDS, best_rate - worst_rate)]
 
-            report = f"""
+            parts: List[str] = [f"""
 📈 <b>ניתוח מגמות</b>
 
 🎯 <b>מגמת ציות:</b> {trend_direction}
@@ -816,114 +1022,224 @@ class ReportsHandler:
 📊 <b>נתונים נוספים:</b>
 • שיעור ציות הכי גבוה: {best_rate:.1f}%
 • שיעור ציות הכי נמוך: {worst_rate:.1f}%
-• יציבות: {"גבוהה" if max(rates) - min(rates) < 20 else "בינונית" if max(rates) - min(rates) < 40 else "נמוכה"}
-"""
+• יציבות: {stability}
+"""]
 
             # Recommendations based on trends
             if trend_direction == "מתדרדרת":
-                report += "\n💡 <b>המלצות:</b>\n• כדאי לבדוק סיבות לירידה בציות\n• ייתכן שצריך התאמת זמני התזכורות\n• מומלץ התייעצות עם הרופא"
+                parts.append(
+                    "\n💡 <b>המלצות:</b>\n• כדאי לבדוק סיבות לירידה בציות\n• ייתכן שצריך התאמת זמני התזכורות\n• מומלץ התייעצות עם הרופא"
+                )
             elif trend_direction == "משתפרת":
-                report += "\n🎉 <b>כל הכבוד!</b> המגמה חיובית, המשיכו כך!"
+                parts.append("\n🎉 <b>כל הכבוד!</b> המגמה חיובית, המשיכו כך!")
 
-            return report
+            return "".join(parts)
 
         except Exception as e:
-            logger.error(f"Error generating trends report: {e}")
-            return f"{config.EMOJIS['error']} שגיאה ביצירת ניתוח מגמות"
+            logger.exception("Error generating trends report: %s", e)
+            return _TRENDS_ERROR_MESSAGE
 
-    async def _send_report_to_caregivers(
-        self, user_id: int, report_title: str, report_content: str, context: ContextTypes.DEFAULT_TYPE = None
-    ):
-        """Send report to all caregivers"""
+    async def _send_report_to_caregivers(self, user_id: int, report_title: str, report_content: str, bot=None, user=None):
+        """Send report to all caregivers using the given bot (typically ``context.bot``)
+
+        Callers that already hold the patient's ``User`` pass it to skip re-fetching it.
+        """
+        if bot is None:
+            return
         try:
-            caregivers = await DatabaseManager.get_user_caregivers(user_id, active_only=True)
-            user = await DatabaseManager.get_user_by_id(user_id)
+            caregivers_query = DatabaseManager.get_user_caregivers(
+                user_id, active_only=True, permissions=_REPORT_CAREGIVER_PERMISSIONS
+            )
+            if user is None:
+                caregivers, user = await asyncio.gather(caregivers_query, DatabaseManager.get_user_by_id(user_id))
+            else:
+                caregivers = await caregivers_query
             if not caregivers or not user:
                 return
-            message = f"""
-{config.EMOJIS['report']} <b>{report_title}</b>
-👤 <b>מטופל:</b> {user.first_name} {user.last_name or ''}
-📅 <b>תאריך:</b> {format_datetime_hebrew(datetime.now())}
-
-{report_content}
-
-{config.EMOJIS['info']} לשיתוף עם מטפל יש להשתמש ב"שלח לרופא" או לשתף ידנית.
-            """
-            for caregiver in caregivers:
-                if (getattr(caregiver, "permissions", "view") in ("view", "manage", "admin")) and getattr(
-                    caregiver, "caregiver_telegram_id", None
-                ):
-                    try:
-                        if context and getattr(context, "bot", None):
-                            await context.bot.send_message(
-                                chat_id=caregiver.caregiver_telegram_id, text=message, parse_mode="HTML"
-                            )
-                    except Exception as e:
-                        logger.error(f"Failed to send report to caregiver {caregiver.id}: {e}")
+            message = _CAREGIVER_REPORT_TEMPLATE.substitute(
+                title=report_title,
+                patient=f"{user.first_name} {user.last_name or ''}",
+                sent_at=format_datetime_hebrew(datetime.now()),
+                body=report_content,
+            )
+            recipients = [c for c in caregivers if getattr(c, "caregiver_telegram_id", None)]
+            if not recipients:
+                return
+            if config.RELAY_CHAT_ID:
+                # Upload the payload once, then let Telegram copy it server-side
+                relayed = await bot.send_message(chat_id=config.RELAY_CHAT_ID, text=message, parse_mode="HTML")
+                sends = [
+                    bot.copy_message(
+                        chat_id=c.caregiver_telegram_id, from_chat_id=config.RELAY_CHAT_ID, message_id=relayed.message_id
+                    )
+                    for c in recipients
+                ]
+            else:
+                sends = [
+                    bot.send_message(chat_id=c.caregiver_telegram_id, text=message, parse_mode="HTML") for c in recipients
+                ]
+            results = await asyncio.gather(*sends, return_exceptions=True)
+            for caregiver, result in zip(recipients, results):
+                if isinstance(result, Exception):
+                    logger.error("Failed to send report to caregiver %s: %s", caregiver.id, result, exc_info=result)
         except Exception as e:
-            logger.error(f"Error sending report to caregivers: {e}")
+            logger.exception("Error sending report to caregivers: %s", e)
+
+    async def _gather_sections(self, *sections) -> List[str]:
+        """Run independent report sections concurrently; a failed section is logged and left empty"""
+        results = await asyncio.gather(*sections, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Error generating report section: %s", result, exc_info=result)
+        return [result if isinstance(result, str) else "" for result in results]
+
+    async def _generate_custom_full_report(self, user_id: int, start_date: date, end_date: date) -> str:
+        """Comprehensive custom report: adherence, symptoms and trends"""
+        return self._combine_reports(
+            await self._gather_sections(
+                self._generate_adherence_report(user_id, start_date, end_date),
+                self._generate_symptoms_report(user_id, start_date, end_date),
+                self._generate_trends_report(user_id, start_date, end_date),
+            )
+        )
 
-    def _combine_reports(self, reports: List[str]) -> str:
+    def _combine_reports(self, reports: Iterable[Optional[str]]) -> str:
         """Combine multiple reports into one"""
-        combined = "\n\n".join([report for report in reports if report])
-        return combined
+        return "\n\n".join(filter(None, reports))
 
     def _get_mood_emoji(self, mood_score: float) -> str:
         """Get emoji for mood score"""
-        if mood_score <= 2:
-            return "😩"
-        elif mood_score <= 4:
-            return "😟"
-        elif mood_score <= 6:
-            return "😐"
-        elif mood_score <= 8:
-            return "😊"
-        else:
-            return "😄"
+        return _MOOD_EMOJIS[bisect_left(_MOOD_THRESHOLDS, mood_score)]
+
+    async def get_active_medicines(self, user_id: int) -> List:
+        """Active medicines for a user, shared with report generation until ``invalidate_user_cache`` drops them."""
+        return await self._get_user_medicines(user_id)
+
+    def invalidate_user_cache(self, user_id: int) -> None:
+        """Drop cached report inputs and rendered reports for a user (call after their data changes)."""
+        self._report_cache.remove(f"medicines:{user_id}")
+        self._report_cache.remove(f"daily:{user_id}")
+        self._report_cache.remove(f"report:weekly:{user_id}")
+        self._report_cache.remove(f"report:monthly:{user_id}")
+        self._report_cache.remove(f"inventory:{user_id}")
+
+    async def _get_cached_report(
+        self, user_id: int, report_type: str, end_date: date, build: Callable[[], Awaitable[str]]
+    ) -> str:
+        """Return a recently rendered report body for the same end date, or build and cache a new one."""
+        key = f"report:{report_type}:{user_id}"
+        cached = self._report_cache.get(key)
+        if cached is not None and cached[0] == end_date:
+            return cached[1]
+        full_report = await build()
+        self._report_cache.set(key, (end_date, full_report))
+        return full_report
+
+    async def get_db_user(self, telegram_id: int):
+        """Return the DB user for a Telegram id, reusing recent lookups.
+
+        Cached users may lag behind profile edits for a few minutes unless ``forget_db_user`` is called.
+        Unknown ids are not cached, so a user created by /start is found on the next lookup.
+        """
+        user = self._user_cache.get(f"tg:{telegram_id}")
+        if user is None:
+            user = await DatabaseManager.get_user_by_telegram_id(telegram_id)
+            if user is not None:
+                self._user_cache.set(f"tg:{telegram_id}", user)
+        return user
+
+    def remember_db_user(self, telegram_id: int, user) -> None:
+        """Cache a DB user that was just created or reloaded."""
+        self._user_cache.set(f"tg:{telegram_id}", user)
+
+    def forget_db_user(self, telegram_id: int) -> None:
+        """Drop a cached DB user after their profile changes."""
+        self._user_cache.remove(f"tg:{telegram_id}")
+
+    async def _join_inflight(self, key: tuple, load: Callable[[], Awaitable]):
+        """Run ``load`` once per key at a time; concurrent callers with the same key await the same result."""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(load())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one caller being cancelled does not cancel the load for the others
+        return await asyncio.shield(future)
+
+    async def _get_user_medicines(self, user_id: int) -> List:
+        """Get active user medicines, reusing a recent fetch when available."""
+        key = f"medicines:{user_id}"
+        medicines = self._report_cache.get(key)
+        if medicines is None:
+            medicines = await self._join_inflight(("medicines", user_id), lambda: self._load_user_medicines(user_id))
+        return medicines
+
+    async def _load_user_medicines(self, user_id: int) -> List:
+        """Fetch active user medicines and store them in the report cache."""
+        medicines = await DatabaseManager.get_user_medicines(user_id)
+        self._report_cache.set(f"medicines:{user_id}", medicines)
+        return medicines
+
+    async def _get_planned_per_day(self, user_id: int, medicines: List) -> Dict[int, int]:
+        """Number of active schedules per medicine id; sections of one report running together share a single load."""
+        medicine_ids = tuple(m.id for m in medicines)
+        return await self._join_inflight(("planned", user_id, medicine_ids), lambda: self._load_planned_per_day(medicine_ids))
+
+    async def _load_planned_per_day(self, medicine_ids: Tuple[int, ...]) -> Dict[int, int]:
+        """Fetch every medicine's schedules concurrently and count the active ones."""
+        schedules = await asyncio.gather(*(DatabaseManager.get_medicine_schedules(mid) for mid in medicine_ids))
+        return {mid: sum(1 for s in rows if s.is_active) for mid, rows in zip(medicine_ids, schedules)}
 
     async def _calculate_daily_adherence(self, user_id: int, start_date: date, end_date: date) -> Dict[date, float]:
         """Calculate daily adherence rates using planned schedules vs actual logs."""
+        start_date = _clamp_report_start(start_date, end_date)
+        # Cached per user as {(start, end): rates} so invalidation drops every range at once
+        cached_ranges = self._report_cache.get(f"daily:{user_id}") or {}
+        if (start_date, end_date) in cached_ranges:
+            return cached_ranges[(start_date, end_date)]
+        return await self._join_inflight(
+            ("daily", user_id, start_date, end_date), lambda: self._load_daily_adherence(user_id, start_date, end_date)
+        )
+
+    async def _load_daily_adherence(self, user_id: int, start_date: date, end_date: date) -> Dict[date, float]:
+        """Compute daily adherence rates for a clamped range and store them in the report cache."""
         try:
+            # Planned counts per day based on active schedules (the same for every day in the range)
+            medicines = await self._get_user_medicines(user_id)
+            planned_total = sum((await self._get_planned_per_day(user_id, medicines)).values())
+
+            # Actual taken logs for the whole range in one query, bucketed by day. A dose counts on the day
+            # it was scheduled and on the day it was logged, matching get_doses_for_date.
+            taken_by_day: Counter = Counter()
+            for dose in await DatabaseManager.get_user_doses_in_range(user_id, start_date, end_date, status="taken"):
+                days = {dt.date() for dt in (dose.scheduled_time, dose.created_at) if dt is not None}
+                taken_by_day.update(d for d in days if start_date <= d <= end_date)
+
             daily_rates = {}
             current_date = start_date
-
             while current_date <= end_date:
-                # Actual logs for the day (taken/skipped)
-                day_doses = await DatabaseManager.get_doses_for_date(user_id, current_date)
-                taken = len([d for d in (day_doses or []) if getattr(d, "status", None) == "taken"])
-                skipped = len([d for d in (day_doses or []) if getattr(d, "status", None) == "skipped"])
-
-                # Planned counts for the day based on active schedules
-                medicines = await DatabaseManager.get_user_medicines(user_id)
-                planned_total = 0
-                for med in medicines:
-                    schedules = await DatabaseManager.get_medicine_schedules(med.id)
-                    planned_total += len([s for s in schedules if getattr(s, "is_active", True)])
-
-                total = planned_total
-                if total > 0:
-                    adherence_pct = (taken / total) * 100
-                else:
-                    adherence_pct = 0
-                daily_rates[current_date] = adherence_pct
-
+                taken = taken_by_day[current_date]
+                daily_rates[current_date] = (taken / planned_total) * 100 if planned_total > 0 else 0
                 current_date += timedelta(days=1)
 
+            # Re-read the cache: other ranges may have been stored while this one was loading
+            cache_key = f"daily:{user_id}"
+            cached_ranges = self._report_cache.get(cache_key) or {}
+            cached_ranges[(start_date, end_date)] = daily_rates
+            self._report_cache.set(cache_key, cached_ranges)
             return daily_rates
 
         except Exception as e:
-            logger.error(f"Error calculating daily adherence: {e}")
+            logger.exception("Error calculating daily adherence: %s", e)
             return {}
 
     async def cancel_report(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Cancel report generation"""
         try:
-            user_id = update.effective_user.id
+            # Per-user report state lives in context.user_data (framework-managed lifecycle)
+            context.user_data.pop("report", None)
 
-            if user_id in self.user_report_data:
-                del self.user_report_data[user_id]
-
-            message = f"{config.EMOJIS['info']} יצירת הדוח בוטלה"
+            message = _REPORT_CANCELLED_MESSAGE
 
             if update.callback_query:
                 await update.callback_query.answer()
@@ -934,44 +1250,50 @@ class ReportsHandler:
             return ConversationHandler.END
 
         except Exception as e:
-            logger.error(f"Error canceling report: {e}")
+            logger.exception("Error canceling report: %s", e)
             return ConversationHandler.END
 
     async def _send_error_message(self, update: Update, error_text: str):
         """Send error message to user"""
+        message = f"{_ERROR_PREFIX} {error_text}"
         try:
             # Support both Update and CallbackQuery
             if hasattr(update, "data") and hasattr(update, "edit_message_text"):
-                await update.edit_message_text(
-                    f"{config.EMOJIS['error']} {error_text}",
-                    reply_markup=InlineKeyboardMarkup(
-                        [[InlineKeyboardButton(f"{config.EMOJIS['home']} תפריט ראשי", callback_data="main_menu")]]
-                    ),
-                )
+                await update.edit_message_text(message, reply_markup=_HOME_ONLY_KEYBOARD)
             elif getattr(update, "callback_query", None):
-                await update.callback_query.edit_message_text(
-                    f"{config.EMOJIS['error']} {error_text}",
-                    reply_markup=InlineKeyboardMarkup(
-                        [[InlineKeyboardButton(f"{config.EMOJIS['home']} תפריט ראשי", callback_data="main_menu")]]
-                    ),
-                )
+                await update.callback_query.edit_message_text(message, reply_markup=_HOME_ONLY_KEYBOARD)
             else:
-                await update.message.reply_text(
-                    f"{config.EMOJIS['error']} {error_text}", reply_markup=get_main_menu_keyboard()
-                )
+                await update.message.reply_text(message, reply_markup=get_main_menu_keyboard())
+        except Exception as e:
+            logger.exception("Error sending error message: %s", e)
+
+    async def _send_no_data_message(self, update: Update):
+        """Tell a user without any medicines or symptom logs that there is nothing to report yet"""
+        try:
+            if getattr(update, "callback_query", None):
+                await update.callback_query.answer()
+                await update.callback_query.edit_message_text(_NO_DATA_MESSAGE, reply_markup=_HOME_ONLY_KEYBOARD)
+            elif getattr(update, "message", None):
+                await update.message.reply_text(_NO_DATA_MESSAGE, reply_markup=get_main_menu_keyboard())
         except Exception as e:
-            logger.error(f"Error sending error message: {e}")
+            logger.exception("Error sending no-data message: %s", e)
 
     async def _generate_full_report(self, user_id: int, start_date: date, end_date: date) -> str:
         """Generate a full report (adherence + symptoms + inventory + trends) for a date range."""
         try:
-            adherence = await self._generate_adherence_report(user_id, start_date, end_date)
-            symptoms = await self._generate_symptoms_report(user_id, start_date, end_date)
-            inventory = await self._generate_inventory_report(user_id)
-            trends = await self._generate_trends_report(user_id, start_date, end_date)
-            return self._combine_reports([adherence, symptoms, inventory, trends])
+            # Symptoms and trends don't need the medicine list, so they start before it is fetched
+            symptoms = asyncio.create_task(self._generate_symptoms_report(user_id, start_date, end_date))
+            trends = asyncio.create_task(self._generate_trends_report(user_id, start_date, end_date))
+            medicines = await self._get_user_medicines(user_id)
+            sections = await self._gather_sections(
+                self._generate_adherence_report(user_id, start_date, end_date, medicines=medicines),
+                symptoms,
+                self._generate_inventory_report(user_id, medicines=medicines),
+                trends,
+            )
+            return self._combine_reports(sections)
         except Exception as e:
-            logger.error(f"Error generating full report: {e}")
+            logger.exception("Error generating full report: %s", e)
             return ""
 
 
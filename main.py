@@ -5,13 +5,23 @@ Designed for deployment on Render platform with webhook support
 """
 
 import asyncio
+import functools
+import hmac
 import logging
 import signal
 import sys
 from contextlib import asynccontextmanager
 from datetime import datetime
 from telegram import Update
-from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, ConversationHandler, filters
+from telegram.ext import (
+    Application,
+    BaseUpdateProcessor,
+    CommandHandler,
+    MessageHandler,
+    CallbackQueryHandler,
+    ConversationHandler,
+    filters,
+)
 from telegram import BotCommand, BotCommandScopeDefault, BotCommandScopeChat
 from telegram.error import TelegramError
 from aiohttp import web
@@ -24,8 +34,15 @@ from handlers.reports_handler import reports_handler
 from handlers.appointments_handler import appointments_handler
 from utils.keyboards import get_reminders_settings_keyboard, get_inventory_main_keyboard
 from utils.time import ensure_aware, get_user_timezone_name
+from utils.helpers import SimpleCache
 from activity_reporter import create_reporter
 
+try:
+    # Faster parsing of webhook bodies; the stdlib parser is the fallback
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 # Configure logging
 logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=getattr(logging, config.LOG_LEVEL))
 logger = logging.getLogger(__name__)
@@ -37,12 +54,105 @@ reporter = create_reporter(
     service_name="Treatment"
 )
 
+# Command list shown only in the admin's chat (built once at import)
+_ADMIN_COMMANDS = (BotCommand("weekly_usage", "כמה השתמשו בשבוע האחרון"),)
+# Admin chat id, normalized once; 0 means no admin is configured
+_ADMIN_TELEGRAM_ID = int(getattr(config, "ADMIN_TELEGRAM_ID", 0) or 0)
+# Updates queued or being handled before the webhook asks Telegram to redeliver later
+_MAX_PENDING_UPDATES = 1000
+# Callback-data prefixes whose buttons are answered by handlers registered ahead of button_callback
+_EXTERNAL_CALLBACK_PREFIXES = frozenset({"dose", "report", "export", "caregiver"})
+
+# Fixed replies, formatted once at import
+_SETTINGS_MESSAGE = f"""
+{config.EMOJIS['settings']} *הגדרות אישיות*
+
+בחרו את ההגדרה שתרצו לשנות:
+            """
+_ADD_MEDICINE_PROMPT = f"""
+{config.EMOJIS['medicine']} <b>הוספת תרופה חדשה</b>
+
+אנא שלחו את שם התרופה:
+            """
+
+
+def _safe_handler(handler):
+    """Log a command handler's failure and answer the user with the generic error message."""
+
+    @functools.wraps(handler)
+    async def wrapper(self, update: Update, context):
+        try:
+            return await handler(self, update, context)
+        except Exception:
+            logger.exception("Error in %s", handler.__name__)
+            if update and update.effective_message:
+                await update.effective_message.reply_text(config.ERROR_MESSAGES["general"])
+
+    return wrapper
+
+
+def _index_by_name(medicines) -> dict:
+    """Map case-folded medicine names to medicines; the first medicine wins when names repeat."""
+    return {m.name.casefold(): m for m in reversed(medicines)}
+
+
+class _PerUserUpdateProcessor(BaseUpdateProcessor):
+    """Process updates from different users concurrently while keeping each user's updates in order.
+
+    Conversation state and ``user_data`` flags assume one update per user at a time, so updates from
+    the same user wait on a per-user lock. PTB takes the base-class semaphore *before* calling
+    ``do_process_update``, so that one is left effectively unbounded: otherwise updates queued behind
+    their user's lock would hold slots and one busy user could stall everyone. The real concurrency
+    cap is taken only once the user's lock is held.
+    """
+
+    def __init__(self, max_concurrent_updates: int):
+        super().__init__(sys.maxsize)
+        self._running = asyncio.Semaphore(max_concurrent_updates)
+        self._user_locks: dict = {}
+        self._pending: dict = {}
+        # Updates handed over by the fetcher and not finished yet, including those waiting on a lock
+        self.pending_updates = 0
+
+    async def do_process_update(self, update, coroutine) -> None:
+        self.pending_updates += 1
+        try:
+            await self._process_in_order(update, coroutine)
+        finally:
+            self.pending_updates -= 1
+
+    async def _process_in_order(self, update, coroutine) -> None:
+        user = getattr(update, "effective_user", None)
+        if user is None:
+            async with self._running:
+                await coroutine
+            return
+        key = user.id
+        lock = self._user_locks.setdefault(key, asyncio.Lock())
+        self._pending[key] = self._pending.get(key, 0) + 1
+        try:
+            async with lock, self._running:
+                await coroutine
+        finally:
+            # Drop the lock once nobody is queued on it, so idle users don't accumulate
+            self._pending[key] -= 1
+            if not self._pending[key]:
+                del self._pending[key]
+                del self._user_locks[key]
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
 
 class MedicineReminderBot:
     """Main bot class with all handlers and lifecycle management"""
 
     def __init__(self):
         self.application = None
+        self._update_processor = None
         self.is_running = False
         # Handler instances
         from handlers import (
@@ -56,8 +166,17 @@ class MedicineReminderBot:
         self._reminder_handler = _reminder_handler
         self._reports_handler = _reports_handler
         self._caregiver_handler = _caregiver_handler
-        # Internal shutdown coordination
-        self._serve_forever_event = None
+        # Inline-keyboard routes keyed by the first "_"-separated token of the callback data
+        self._callback_routes = {
+            "medicine": self._handle_medicine_action,
+            "medicines": self._handle_medicine_action,
+            "settings": lambda update, query, context: self._handle_settings_action(update, context),
+            "tz": lambda update, query, context: self._handle_settings_action(update, context),
+        }
+        # Admin usage stats scan the whole activity log; repeated /weekly_usage taps within a minute reuse them
+        self._usage_cache = SimpleCache(default_ttl=60)
+        # Internal shutdown coordination; the event exists up front so a shutdown during start-up is not missed
+        self._serve_forever_event = asyncio.Event()
         self._shutdown_started = False
         self._runner = None
 
@@ -73,6 +192,9 @@ class MedicineReminderBot:
             # Create application
             builder = Application.builder()
             builder.token(config.BOT_TOKEN)
+            # A slow DB call for one user should not hold up everyone else's updates
+            self._update_processor = _PerUserUpdateProcessor(config.MAX_CONCURRENT_UPDATES)
+            builder.concurrent_updates(self._update_processor)
 
             # Note: Keep Updater enabled to support run_webhook
             self.application = builder.build()
@@ -84,15 +206,14 @@ class MedicineReminderBot:
             await self._register_handlers()
 
             # Configure commands list: empty by default, admin-only weekly_usage in admin chat
-            try:
-                await self.application.bot.set_my_commands([], scope=BotCommandScopeDefault())
-                if int(getattr(config, "ADMIN_TELEGRAM_ID", 0) or 0) > 0:
-                    await self.application.bot.set_my_commands(
-                        [BotCommand("weekly_usage", "כמה השתמשו בשבוע האחרון")],
-                        scope=BotCommandScopeChat(chat_id=int(getattr(config, "ADMIN_TELEGRAM_ID", 0))),
-                    )
-            except Exception as _cmd_exc:
-                logger.warning(f"Failed setting commands list: {_cmd_exc}")
+            # Independent Bot API calls, so they are sent concurrently
+            command_updates = [self.application.bot.set_my_commands([], scope=BotCommandScopeDefault())]
+            if _ADMIN_TELEGRAM_ID > 0:
+                admin_scope = BotCommandScopeChat(chat_id=_ADMIN_TELEGRAM_ID)
+                command_updates.append(self.application.bot.set_my_commands(_ADMIN_COMMANDS, scope=admin_scope))
+            for _cmd_exc in await asyncio.gather(*command_updates, return_exceptions=True):
+                if isinstance(_cmd_exc, Exception):
+                    logger.warning(f"Failed setting commands list: {_cmd_exc}")
 
             # Start scheduler
             await medicine_scheduler.start()
@@ -107,55 +228,66 @@ class MedicineReminderBot:
         """Register all command and callback handlers"""
         app = self.application
 
-        # Activity tracking (runs after other handlers; does not block)
-        app.add_handler(MessageHandler(filters.ALL, self._track_activity_message), group=100)
-        app.add_handler(CallbackQueryHandler(self._track_activity_callback), group=100)
-
-        # Basic Commands
-        app.add_handler(CommandHandler("start", self.start_command))
-        app.add_handler(CommandHandler("help", self.help_command))
-        app.add_handler(CommandHandler("settings", self.settings_command))
-
-        # Medicine Management Commands
-        app.add_handler(CommandHandler("add_medicine", self.add_medicine_command))
-        app.add_handler(CommandHandler("my_medicines", self.my_medicines_command))
-        app.add_handler(CommandHandler("update_inventory", self.update_inventory_command))
-
-        # Reminder Commands
-        app.add_handler(CommandHandler("next_reminders", self.next_reminders_command))
-        app.add_handler(CommandHandler("snooze", self.snooze_command))
-
-        # Tracking Commands
-        app.add_handler(CommandHandler("log_symptoms", self.log_symptoms_command))
-        app.add_handler(CommandHandler("weekly_report", self.weekly_report_command))
-        app.add_handler(CommandHandler("medicine_history", self.medicine_history_command))
-        app.add_handler(CommandHandler("weekly_usage", self.weekly_usage_command))
-
-        # Caregiver Commands
-        app.add_handler(CommandHandler("add_caregiver", self.add_caregiver_command))
-        app.add_handler(CommandHandler("caregiver_settings", self.caregiver_settings_command))
+        # Slash commands, grouped by area
+        commands = (
+            # Basic
+            ("start", self.start_command),
+            ("help", self.help_command),
+            ("settings", self.settings_command),
+            # Medicine management
+            ("add_medicine", self.add_medicine_command),
+            ("my_medicines", self.my_medicines_command),
+            ("update_inventory", self.update_inventory_command),
+            # Reminders
+            ("next_reminders", self.next_reminders_command),
+            ("snooze", self.snooze_command),
+            # Tracking
+            ("log_symptoms", self.log_symptoms_command),
+            ("weekly_report", self.weekly_report_command),
+            ("medicine_history", self.medicine_history_command),
+            ("weekly_usage", self.weekly_usage_command),
+            # Caregivers
+            ("add_caregiver", self.add_caregiver_command),
+            ("caregiver_settings", self.caregiver_settings_command),
+        )
 
-        # Conversation and callback handlers from packages
+        # Conversation and callback handlers from packages (reports handler included)
         from handlers import get_all_conversation_handlers, get_all_callback_handlers
 
-        for conv in get_all_conversation_handlers():
-            app.add_handler(conv)
-        for cb in get_all_callback_handlers():
-            app.add_handler(cb)
-
-        # Reports handler already included above
-
-        # Callback Query Handler for inline keyboards
-        app.add_handler(CallbackQueryHandler(self.button_callback))
-
-        # Message handler for text input
-        app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_text_message))
+        # One bulk registration; order within group 0 is priority order:
+        # commands, conversations, package callbacks, then the generic inline-keyboard and text fallbacks
+        app.add_handlers(
+            {
+                0: [
+                    *(CommandHandler(name, callback) for name, callback in commands),
+                    *get_all_conversation_handlers(),
+                    *get_all_callback_handlers(),
+                    CallbackQueryHandler(self.button_callback),
+                    MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_text_message),
+                ],
+                # Activity tracking (runs after other handlers; does not block)
+                100: [
+                    MessageHandler(filters.ALL, self._track_activity_message),
+                    CallbackQueryHandler(self._track_activity_callback),
+                ],
+            }
+        )
 
         # Error handler
         app.add_error_handler(self.error_handler)
 
         logger.info("All handlers registered successfully")
 
+    async def _get_db_user(self, telegram_id: int):
+        """Return the DB user for a Telegram id from the cache shared with the reports handler."""
+        return await self._reports_handler.get_db_user(telegram_id)
+
+    async def _invalidate_reports(self, telegram_id: int) -> None:
+        """Drop cached report inputs for a Telegram user after a write that feeds their reports."""
+        db_user = await self._get_db_user(telegram_id)
+        if db_user is not None:
+            self._reports_handler.invalidate_user_cache(db_user.id)
+
     async def _track_activity_message(self, update: Update, context):
         """Track user activity from messages"""
         reporter.report_activity(update.effective_user.id)
@@ -163,7 +295,7 @@ class MedicineReminderBot:
             user = update.effective_user
             if not user:
                 return
-            db_user = await DatabaseManager.get_user_by_telegram_id(user.id)
+            db_user = await self._get_db_user(user.id)
             if db_user:
                 await DatabaseManager.log_user_activity(db_user.id, "message")
         except Exception:
@@ -177,260 +309,229 @@ class MedicineReminderBot:
             user = update.effective_user
             if not user:
                 return
-            db_user = await DatabaseManager.get_user_by_telegram_id(user.id)
+            db_user = await self._get_db_user(user.id)
             if db_user:
                 await DatabaseManager.log_user_activity(db_user.id, "callback")
         except Exception:
             pass
 
+    @_safe_handler
     async def start_command(self, update: Update, context):
         """Handle /start command"""
         reporter.report_activity(update.effective_user.id)
-        try:
-            user = update.effective_user
-            # Deep-link args: /start invite_CODE
-            text = (update.message.text or "").strip()
-            if text.startswith("/start ") and "invite_" in text:
-                code = text.split("invite_", 1)[-1].strip()
-                inv = await DatabaseManager.get_invite_by_code(code)
-                if (
-                    not inv
-                    or getattr(inv, "status", "active") != "active"
-                    or (getattr(inv, "expires_at", None) and getattr(inv, "expires_at") < datetime.utcnow())
-                ):
-                    await update.message.reply_text("קוד הזמנה לא תקין או פג תוקף.")
-                else:
-                    # Ask confirmation
-                    from telegram import InlineKeyboardMarkup, InlineKeyboardButton
-
-                    context.user_data["pending_invite_code"] = code
-                    await update.message.reply_text(
-                        f"התבקשת להצטרף כמטפל עבור משתמש {inv.user_id}. לאשר?",
-                        reply_markup=InlineKeyboardMarkup(
-                            [
-                                [InlineKeyboardButton("אישור", callback_data="invite_accept")],
-                                [InlineKeyboardButton("ביטול", callback_data="invite_reject")],
-                            ]
-                        ),
-                    )
-                return
-            # Show main menu immediately for faster UX
-            from utils.keyboards import get_main_menu_keyboard
-
-            await update.message.reply_text(
-                config.WELCOME_MESSAGE, parse_mode="Markdown", reply_markup=get_main_menu_keyboard()
-            )
-            telegram_id = user.id
+        user = update.effective_user
+        # Deep-link args: /start invite_CODE
+        text = (update.message.text or "").strip()
+        if text.startswith("/start ") and "invite_" in text:
+            code = text.split("invite_", 1)[-1].strip()
+            inv = await DatabaseManager.get_invite_by_code(code)
+            if (
+                not inv
+                or getattr(inv, "status", "active") != "active"
+                or (getattr(inv, "expires_at", None) and getattr(inv, "expires_at") < datetime.utcnow())
+            ):
+                await update.message.reply_text("קוד הזמנה לא תקין או פג תוקף.")
+            else:
+                # Ask confirmation
+                from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 
-            # Get or create user in database (after showing UI)
-            db_user = await DatabaseManager.get_user_by_telegram_id(telegram_id)
-            if not db_user:
-                db_user = await DatabaseManager.create_user(
-                    telegram_id=telegram_id, username=user.username, first_name=user.first_name, last_name=user.last_name
+                context.user_data["pending_invite_code"] = code
+                await update.message.reply_text(
+                    f"התבקשת להצטרף כמטפל עבור משתמש {inv.user_id}. לאשר?",
+                    reply_markup=InlineKeyboardMarkup(
+                        [
+                            [InlineKeyboardButton("אישור", callback_data="invite_accept")],
+                            [InlineKeyboardButton("ביטול", callback_data="invite_reject")],
+                        ]
+                    ),
                 )
-                logger.info(f"Created new user: {telegram_id}")
+            return
+        # Show main menu immediately for faster UX
+        from utils.keyboards import get_main_menu_keyboard
 
-        except Exception as e:
-            logger.error(f"Error in start command: {e}")
-            await update.message.reply_text(config.ERROR_MESSAGES["general"])
+        await update.message.reply_text(config.WELCOME_MESSAGE, parse_mode="Markdown", reply_markup=get_main_menu_keyboard())
+        telegram_id = user.id
+
+        # Get or create user in database (after showing UI)
+        db_user = await self._get_db_user(telegram_id)
+        if not db_user:
+            db_user = await DatabaseManager.create_user(
+                telegram_id=telegram_id, username=user.username, first_name=user.first_name, last_name=user.last_name
+            )
+            self._reports_handler.remember_db_user(telegram_id, db_user)
+            logger.info(f"Created new user: {telegram_id}")
 
+    @_safe_handler
     async def weekly_usage_command(self, update: Update, context):
         """Handle /weekly_usage command"""
         reporter.report_activity(update.effective_user.id)
-        try:
-            caller_tid = update.effective_user.id if update and update.effective_user else 0
-            if int(getattr(config, "ADMIN_TELEGRAM_ID", 0) or 0) != int(caller_tid):
-                await update.message.reply_text(config.ERROR_MESSAGES.get("unauthorized", "אין הרשאה."))
-                return
-            from datetime import datetime as dt, timedelta
-            from utils.time import ensure_aware, get_user_timezone_name
+        caller_tid = update.effective_user.id if update and update.effective_user else 0
+        if _ADMIN_TELEGRAM_ID <= 0 or caller_tid != _ADMIN_TELEGRAM_ID:
+            await update.message.reply_text(config.ERROR_MESSAGES.get("unauthorized", "אין הרשאה."))
+            return
+        from datetime import datetime as dt, timedelta
+        from utils.time import ensure_aware, get_user_timezone_name
 
+        cached = self._usage_cache.get("weekly")
+        if cached is not None:
+            count, rows = cached
+        else:
             since = dt.utcnow() - timedelta(days=7)
-            count = await DatabaseManager.count_active_users_since(since)
-
-            # Try to fetch detailed list
-            try:
-                rows = await DatabaseManager.get_active_users_with_last_activity(since)
-            except Exception:
+            # The count and the detailed list are independent reads
+            count, rows = await asyncio.gather(
+                DatabaseManager.count_active_users_since(since),
+                DatabaseManager.get_active_users_with_last_activity(since),
+                return_exceptions=True,
+            )
+            if isinstance(count, BaseException):
+                raise count
+            if isinstance(rows, BaseException):
                 rows = []
+            self._usage_cache.set("weekly", (count, rows))
 
-            # Compose message
-            header = f"ב-7 הימים האחרונים השתמשו בבוט {count} משתמשים ייחודיים."
-            if not rows:
-                await update.message.reply_text(header)
-                return
+        # Compose message
+        header = f"ב-7 הימים האחרונים השתמשו בבוט {count} משתמשים ייחודיים."
+        if not rows:
+            await update.message.reply_text(header)
+            return
 
-            # Limit to top N to avoid Telegram limits
-            MAX_ROWS = 30
-            shown = rows[:MAX_ROWS]
+        # Limit to top N to avoid Telegram limits
+        MAX_ROWS = 30
+        shown = rows[:MAX_ROWS]
 
-            # Display times in admin's timezone if possible
-            admin_user = await DatabaseManager.get_user_by_telegram_id(caller_tid)
-            tz_name = get_user_timezone_name(admin_user) if admin_user else None
+        # Display times in admin's timezone if possible
+        admin_user = await DatabaseManager.get_user_by_telegram_id(caller_tid)
+        tz_name = get_user_timezone_name(admin_user) if admin_user else None
 
-            lines = [header, "", "משתמשים ופעילות אחרונה:"]
-            for rec in shown:
-                name = (rec.get("first_name") or "") + (f" {rec.get('last_name') or ''}" if rec.get("last_name") else "")
-                name = name.strip() or (rec.get("username") or f"#{rec.get('user_id')}")
-                last_dt = rec.get("last_activity")
-                try:
-                    last_local = ensure_aware(last_dt, tz_name)
-                except Exception:
-                    last_local = last_dt
-                time_str = last_local.strftime("%d/%m %H:%M") if last_local else "?"
-                lines.append(f"• {name} — {time_str}")
+        lines = [header, "", "משתמשים ופעילות אחרונה:"]
+        for rec in shown:
+            name = (rec.get("first_name") or "") + (f" {rec.get('last_name') or ''}" if rec.get("last_name") else "")
+            name = name.strip() or (rec.get("username") or f"#{rec.get('user_id')}")
+            last_dt = rec.get("last_activity")
+            try:
+                last_local = ensure_aware(last_dt, tz_name)
+            except Exception:
+                last_local = last_dt
+            time_str = last_local.strftime("%d/%m %H:%M") if last_local else "?"
+            lines.append(f"• {name} — {time_str}")
 
-            if len(rows) > MAX_ROWS:
-                lines.append("")
-                lines.append(f"ועוד {len(rows) - MAX_ROWS} משתמשים...")
+        if len(rows) > MAX_ROWS:
+            lines.append("")
+            lines.append(f"ועוד {len(rows) - MAX_ROWS} משתמשים...")
 
-            await update.message.reply_text("\n".join(lines))
-        except Exception as e:
-            logger.error(f"Error in weekly_usage command: {e}")
-            await update.message.reply_text(config.ERROR_MESSAGES["general"])
+        await update.message.reply_text("\n".join(lines))
 
+    @_safe_handler
     async def help_command(self, update: Update, context):
         """Handle /help command"""
         reporter.report_activity(update.effective_user.id)
-        try:
-            await update.message.reply_text(config.HELP_MESSAGE, parse_mode="HTML")
-        except Exception as e:
-            logger.error(f"Error in help command: {e}")
-            await update.message.reply_text(config.ERROR_MESSAGES["general"])
+        await update.message.reply_text(config.HELP_MESSAGE, parse_mode="HTML")
 
+    @_safe_handler
     async def settings_command(self, update: Update, context):
         """Handle /settings command"""
         reporter.report_activity(update.effective_user.id)
-        try:
-            from utils.keyboards import get_settings_keyboard
+        from utils.keyboards import get_settings_keyboard
 
-            message = f"""
-{config.EMOJIS['settings']} *הגדרות אישיות*
-
-בחרו את ההגדרה שתרצו לשנות:
-            """
-
-            await update.message.reply_text(message, parse_mode="Markdown", reply_markup=get_settings_keyboard())
-
-        except Exception as e:
-            logger.error(f"Error in settings command: {e}")
-            await update.message.reply_text(config.ERROR_MESSAGES["general"])
+        await update.message.reply_text(_SETTINGS_MESSAGE, parse_mode="Markdown", reply_markup=get_settings_keyboard())
 
+    @_safe_handler
     async def add_medicine_command(self, update: Update, context):
         """Handle /add_medicine command"""
         reporter.report_activity(update.effective_user.id)
-        try:
-            from utils.keyboards import get_cancel_keyboard
-
-            message = f"""
-{config.EMOJIS['medicine']} <b>הוספת תרופה חדשה</b>
-
-אנא שלחו את שם התרופה:
-            """
-
-            await update.message.reply_text(message, parse_mode="HTML")
-
-            # Store conversation state (in real implementation, use ConversationHandler)
-            context.user_data["adding_medicine"] = {"step": "name"}
+        await update.message.reply_text(_ADD_MEDICINE_PROMPT, parse_mode="HTML")
 
-        except Exception as e:
-            logger.error(f"Error in add_medicine command: {e}")
-            await update.message.reply_text(config.ERROR_MESSAGES["general"])
+        # Store conversation state (in real implementation, use ConversationHandler)
+        context.user_data["adding_medicine"] = {"step": "name"}
 
+    @_safe_handler
     async def my_medicines_command(self, update: Update, context):
         """Handle /my_medicines command"""
         reporter.report_activity(update.effective_user.id)
-        try:
-            user = update.effective_user
-            db_user = await DatabaseManager.get_user_by_telegram_id(user.id)
+        user = update.effective_user
+        db_user = await self._get_db_user(user.id)
 
-            if not db_user:
-                await update.message.reply_text("אנא התחילו עם /start")
-                return
+        if not db_user:
+            await update.message.reply_text("אנא התחילו עם /start")
+            return
 
-            medicines = await DatabaseManager.get_user_medicines(db_user.id, active_only=False)
+        medicines = await DatabaseManager.get_user_medicines(db_user.id, active_only=False)
 
-            if not medicines:
-                message = f"""
+        if not medicines:
+            message = f"""
 {config.EMOJIS['info']} <b>אין תרופות רשומות</b>
 
 לחצו על 'הוסף תרופה' כדי להוסיף תרופה ראשונה.
                 """
-            else:
-                message = f"{config.EMOJIS['medicine']} <b>התרופות שלכם:</b>\n\n"
-                for medicine in medicines:
-                    status_emoji = config.EMOJIS["success"] if medicine.is_active else config.EMOJIS["paused"]
-                    inventory_warning = ""
-
-                    if medicine.inventory_count <= medicine.low_stock_threshold:
-                        inventory_warning = f" {config.EMOJIS['warning']}"
-
-                    message += f"{status_emoji} <b>{medicine.name}</b>\n"
-                    message += f"   {config.EMOJIS['dosage']} {medicine.dosage}\n"
-                    message += f"   📦 מלאי: {medicine.inventory_count}{inventory_warning}\n\n"
-
-            from utils.keyboards import get_medicines_keyboard
+        else:
+            emojis = config.EMOJIS
+            active_emoji, paused_emoji = emojis["success"], emojis["paused"]
+            dosage_emoji, low_stock_warning = emojis["dosage"], f" {emojis['warning']}"
+            parts = [f"{emojis['medicine']} <b>התרופות שלכם:</b>\n\n"]
+            for medicine in medicines:
+                status_emoji = active_emoji if medicine.is_active else paused_emoji
+                inventory_warning = low_stock_warning if medicine.inventory_count <= medicine.low_stock_threshold else ""
+                parts.append(
+                    f"{status_emoji} <b>{medicine.name}</b>\n"
+                    f"   {dosage_emoji} {medicine.dosage}\n"
+                    f"   📦 מלאי: {medicine.inventory_count}{inventory_warning}\n\n"
+                )
+            message = "".join(parts)
 
-            await update.message.reply_text(
-                message, parse_mode="HTML", reply_markup=get_medicines_keyboard(medicines if medicines else [])
-            )
+        from utils.keyboards import get_medicines_keyboard
 
-        except Exception as e:
-            logger.error(f"Error in my_medicines command: {e}")
-            await update.message.reply_text(config.ERROR_MESSAGES["general"])
+        await update.message.reply_text(
+            message, parse_mode="HTML", reply_markup=get_medicines_keyboard(medicines if medicines else [])
+        )
 
+    @_safe_handler
     async def update_inventory_command(self, update: Update, context):
         """Handle /update_inventory command"""
         reporter.report_activity(update.effective_user.id)
-        try:
-            user = update.effective_user
-            db_user = await DatabaseManager.get_user_by_telegram_id(user.id)
-            if not db_user:
-                await update.message.reply_text("אנא התחילו עם /start")
-                return
+        user = update.effective_user
+        db_user = await self._get_db_user(user.id)
+        if not db_user:
+            await update.message.reply_text("אנא התחילו עם /start")
+            return
 
-            args = context.args if hasattr(context, "args") else []
-            if len(args) < 2:
-                await update.message.reply_text("שימוש: /update_inventory <שם_תרופה> <כמות_חדשה>")
-                return
+        args = context.args if hasattr(context, "args") else []
+        if len(args) < 2:
+            await update.message.reply_text("שימוש: /update_inventory <שם_תרופה> <כמות_חדשה>")
+            return
 
-            medicine_name = args[0]
-            try:
-                new_count = int(args[1])
-            except ValueError:
-                await update.message.reply_text("כמות חייבת להיות מספר שלם")
-                return
+        medicine_name = args[0]
+        try:
+            new_count = int(args[1])
+        except ValueError:
+            await update.message.reply_text("כמות חייבת להיות מספר שלם")
+            return
 
+        # Repeat updates reuse the medicine list the reports handler already holds
+        wanted = medicine_name.casefold()
+        medicines = await self._reports_handler.get_active_medicines(db_user.id)
+        selected = _index_by_name(medicines).get(wanted)
+        if selected is None:
+            # The shared list may predate an added or renamed medicine, so confirm against the database
             medicines = await DatabaseManager.get_user_medicines(db_user.id)
-            if not medicines:
-                await update.message.reply_text("לא נמצאו תרופות בעבורכם")
-                return
+            selected = _index_by_name(medicines).get(wanted)
 
-            selected = None
-            for m in medicines:
-                if m.name.lower() == medicine_name.lower():
-                    selected = m
-                    break
-
-            if not selected:
-                await update.message.reply_text("לא נמצאה תרופה בשם הזה")
-                return
+        if not medicines:
+            await update.message.reply_text("לא נמצאו תרופות בעבורכם")
+            return
 
-            await DatabaseManager.update_inventory(selected.id, new_count)
-            await update.message.reply_text(f"{config.EMOJIS['success']} עודכן מלאי לתרופה {selected.name}: {new_count}")
+        if not selected:
+            await update.message.reply_text("לא נמצאה תרופה בשם הזה")
+            return
 
-        except Exception as e:
-            logger.error(f"Error in update_inventory command: {e}")
-            await update.message.reply_text(config.ERROR_MESSAGES["general"])
+        await DatabaseManager.update_inventory(selected.id, new_count)
+        self._reports_handler.invalidate_user_cache(selected.user_id)
+        await update.message.reply_text(f"{config.EMOJIS['success']} עודכן מלאי לתרופה {selected.name}: {new_count}")
 
+    @_safe_handler
     async def snooze_command(self, update: Update, context):
         """Handle /snooze command"""
         reporter.report_activity(update.effective_user.id)
-        try:
-            await update.message.reply_text("להשהיית תזכורת, השתמשו בכפתור דחייה שמופיע בהתראה.")
-        except Exception as e:
-            logger.error(f"Error in snooze command: {e}")
-            await update.message.reply_text(config.ERROR_MESSAGES["general"])
+        await update.message.reply_text("להשהיית תזכורת, השתמשו בכפתור דחייה שמופיע בהתראה.")
 
     async def log_symptoms_command(self, update: Update, context):
         """Handle /log_symptoms command"""
@@ -470,54 +571,38 @@ class MedicineReminderBot:
             except Exception:
                 pass
 
+    @_safe_handler
     async def weekly_report_command(self, update: Update, context):
         """Handle /weekly_report command"""
         reporter.report_activity(update.effective_user.id)
-        try:
-            await update.message.reply_text("דוח שבועי יתווסף בקרוב.")
-        except Exception as e:
-            logger.error(f"Error in weekly_report command: {e}")
-            await update.message.reply_text(config.ERROR_MESSAGES["general"])
+        await update.message.reply_text("דוח שבועי יתווסף בקרוב.")
 
+    @_safe_handler
     async def medicine_history_command(self, update: Update, context):
         """Handle /medicine_history command"""
         reporter.report_activity(update.effective_user.id)
-        try:
-            await update.message.reply_text("היסטוריית תרופות תתווסף בקרוב.")
-        except Exception as e:
-            logger.error(f"Error in medicine_history command: {e}")
-            await update.message.reply_text(config.ERROR_MESSAGES["general"])
+        await update.message.reply_text("היסטוריית תרופות תתווסף בקרוב.")
 
+    @_safe_handler
     async def add_caregiver_command(self, update: Update, context):
         """Handle /add_caregiver command"""
         reporter.report_activity(update.effective_user.id)
-        try:
-            await update.message.reply_text("ניהול מטפל יתווסף בקרוב.")
-        except Exception as e:
-            logger.error(f"Error in add_caregiver command: {e}")
-            await update.message.reply_text(config.ERROR_MESSAGES["general"])
+        await update.message.reply_text("ניהול מטפל יתווסף בקרוב.")
 
+    @_safe_handler
     async def caregiver_settings_command(self, update: Update, context):
         """Handle /caregiver_settings command"""
         reporter.report_activity(update.effective_user.id)
-        try:
-            await update.message.reply_text("הגדרות מטפל יתווסף בקרוב.")
-        except Exception as e:
-            logger.error(f"Error in caregiver_settings command: {e}")
-            await update.message.reply_text(config.ERROR_MESSAGES["general"])
+        await update.message.reply_text("הגדרות מטפל יתווסף בקרוב.")
 
+    @_safe_handler
     async def next_reminders_command(self, update: Update, context):
         """Handle /next_reminders command"""
         reporter.report_activity(update.effective_user.id)
-        try:
-            # Delegate to reminder handler rich view
-            from handlers import reminder_handler
-
-            await reminder_handler.show_next_reminders(update, context)
+        # Delegate to reminder handler rich view
+        from handlers import reminder_handler
 
-        except Exception as e:
-            logger.error(f"Error in next_reminders command: {e}")
-            await update.message.reply_text(config.ERROR_MESSAGES["general"])
+        await reminder_handler.show_next_reminders(update, context)
 
     async def button_callback(self, update: Update, context):
         """Handle inline keyboard button presses"""
@@ -573,6 +658,7 @@ class MedicineReminderBot:
                         await DatabaseManager.replace_medicine_schedules(medicine_id, [new_time])
                         # Reschedule reminders
                         user = await DatabaseManager.get_user_by_telegram_id(query.from_user.id)
+                        self._reports_handler.invalidate_user_cache(user.id)
                         await medicine_scheduler.cancel_medicine_reminders(user.id, medicine_id)
                         await medicine_scheduler.schedule_medicine_reminder(
                             user_id=user.id,
@@ -598,11 +684,16 @@ class MedicineReminderBot:
                     await query.edit_message_text("שעה לא תקינה")
                     return
 
-            # Handle different callback types
-            if data.startswith("dose_taken_") or data.startswith("dose_snooze_") or data.startswith("dose_skip_"):
-                # Handled by reminder handler callbacks (already registered)
+            # Handle different callback types; whole prefixes are routed by their first "_"-separated token
+            prefix = data.split("_", 1)[0]
+            if prefix in _EXTERNAL_CALLBACK_PREFIXES:
+                # Handled by the reminder, reports and caregiver handlers (already registered)
+                return
+            route = self._callback_routes.get(prefix)
+            if route is not None:
+                await route(update, query, context)
                 return
-            elif data == "main_menu":
+            if data == "main_menu":
                 from utils.keyboards import get_main_menu_keyboard
 
                 await query.edit_message_text(config.WELCOME_MESSAGE, parse_mode="Markdown")
@@ -618,14 +709,6 @@ class MedicineReminderBot:
                 await self.application.bot.send_message(
                     chat_id=query.message.chat_id, text="בחרו פעולה:", reply_markup=get_main_menu_keyboard()
                 )
-            elif data.startswith("medicine_") or data.startswith("medicines_"):
-                # Route to internal medicine action handler which covers all medicine flows
-                await self._handle_medicine_action(update, query, context)
-                return
-            elif data == "medicine_next_page":
-                # TODO: implement paging; for now just re-render list (simple UX)
-                await self._handle_medicine_action(update, query, context)
-                return
             elif data.startswith("rem_edit_"):
                 # Open time selection for a medicine
                 try:
@@ -664,6 +747,7 @@ class MedicineReminderBot:
                     await query.edit_message_text(config.ERROR_MESSAGES["medicine_not_found"])
                     return
                 await DatabaseManager.set_medicine_active(medicine_id, False)
+                self._reports_handler.invalidate_user_cache(med.user_id)
                 await query.edit_message_text(f"{config.EMOJIS['success']} התזכורת בוטלה לתרופה {med.name}")
                 return
             elif data == "symptoms_menu":
@@ -698,17 +782,14 @@ class MedicineReminderBot:
 
                 await reminder_handler.show_next_reminders(update, context)
                 return
-            elif data.startswith("settings_") or data.startswith("tz_"):
-                await self._handle_settings_action(update, context)
-            elif data.startswith("report_") or data.startswith("report_action_") or data.startswith("export_report_"):
-                # Routed by reports handler; do nothing here (already registered)
-                return
             # Confirmation dialogs (generic)
             elif data.startswith("symdel_"):
                 parts = data.split("_")
                 if parts[-1] == "confirm":
                     log_id = int(parts[-2])
                     ok = await DatabaseManager.delete_symptom_log(log_id)
+                    if ok:
+                        await self._invalidate_reports(query.from_user.id)
                     await query.edit_message_text(
                         f"{config.EMOJIS['success']} הרישום נמחק" if ok else f"{config.EMOJIS['error']} הרישום לא נמצא"
                     )
@@ -733,9 +814,6 @@ class MedicineReminderBot:
             elif data.startswith("inventory_"):
                 # Handled by medicine handler conversation entry points
                 return
-            elif data.startswith("caregiver_"):
-                # Routed by caregiver handler; do nothing here
-                return
             elif data.startswith("symptoms_"):
                 # Minimal inline handling for symptoms
                 if data.startswith("symptoms_log_med_"):
@@ -890,21 +968,18 @@ class MedicineReminderBot:
         medicine_id = int(query.data.split("_")[2])
         user = query.from_user
 
-        # Log dose taken using UTC for storage
-        await DatabaseManager.log_dose_taken(medicine_id, datetime.utcnow())
-
-        # Update inventory
-        medicine = await DatabaseManager.get_medicine_by_id(medicine_id)
-        if medicine and medicine.inventory_count > 0:
-            new_count = medicine.inventory_count - 1
-            await DatabaseManager.update_inventory(medicine_id, new_count)
+        # Log the dose (UTC for storage) and use up one unit of stock in a single DB call
+        recorded = await DatabaseManager.record_dose_taken(medicine_id, datetime.utcnow())
+        if recorded:
+            owner_id, new_count = recorded
+            self._reports_handler.invalidate_user_cache(owner_id)
 
         # Reset reminder attempts
         reminder_key = f"{user.id}_{medicine_id}"
         medicine_scheduler.reminder_attempts[reminder_key] = 0
 
         await query.edit_message_text(
-            f"{config.EMOJIS['success']} נטילת התרופה אושרה!\n" f"מלאי נותר: {new_count if medicine else 'לא ידוע'} כדורים"
+            f"{config.EMOJIS['success']} נטילת התרופה אושרה!\n" f"מלאי נותר: {new_count if recorded else 'לא ידוע'} כדורים"
         )
 
     async def _handle_dose_snooze(self, query, context):
@@ -947,6 +1022,7 @@ class MedicineReminderBot:
                     name=name,
                     dosage=dosage,
                 )
+                self._reports_handler.invalidate_user_cache(db_user.id)
                 context.user_data.pop("adding_medicine", None)
                 await update.message.reply_text(
                     f"{config.EMOJIS['success']} התרופה נוספה בהצלחה!",
@@ -1103,6 +1179,7 @@ class MedicineReminderBot:
                     return
                 new_active = not bool(getattr(med, "is_active", True))
                 await DatabaseManager.set_medicine_active(medicine_id, new_active)
+                self._reports_handler.invalidate_user_cache(db_user.id)
                 if not new_active:
                     # Cancel all reminders for this medicine
                     await medicine_scheduler.cancel_medicine_reminders(db_user.id, medicine_id)
@@ -1209,6 +1286,7 @@ class MedicineReminderBot:
                     return
                 user = await DatabaseManager.get_user_by_telegram_id(query.from_user.id)
                 await DatabaseManager.update_user_timezone(user.id, tz)
+                self._reports_handler.forget_db_user(query.from_user.id)
                 await query.edit_message_text(f"{config.EMOJIS['success']} עודכן אזור הזמן ל- {tz}")
             elif data == "settings_reminders":
                 # Show full reminders settings UI
@@ -1400,21 +1478,25 @@ class MedicineReminderBot:
                 field = info.get("field")
                 if field == "name" and len(text) >= 2:
                     await DatabaseManager.update_medicine(mid, name=text)
+                    await self._invalidate_reports(update.effective_user.id)
                     await update.message.reply_text(f"{config.EMOJIS['success']} שם התרופה עודכן")
                     await self.my_medicines_command(update, context)
                     return
                 if field == "dosage" and len(text) >= 1:
                     await DatabaseManager.update_medicine(mid, dosage=text)
+                    await self._invalidate_reports(update.effective_user.id)
                     await update.message.reply_text(f"{config.EMOJIS['success']} המינון עודכן")
                     await self.my_medicines_command(update, context)
                     return
                 if field == "notes":
                     await DatabaseManager.update_medicine(mid, notes=text)
+                    await self._invalidate_reports(update.effective_user.id)
                     await update.message.reply_text(f"{config.EMOJIS['success']} ההערות עודכנו")
                     await self.my_medicines_command(update, context)
                     return
                 if field == "packsize" and text.isdigit():
                     await DatabaseManager.update_medicine(mid, pack_size=int(text))
+                    await self._invalidate_reports(update.effective_user.id)
                     await update.message.reply_text(f"{config.EMOJIS['success']} גודל החבילה עודכן")
                     await self.my_medicines_command(update, context)
                     return
@@ -1445,6 +1527,7 @@ class MedicineReminderBot:
                 else:
                     final_count = delta_or_total
                 await DatabaseManager.update_inventory(int(medicine_id), final_count)
+                self._reports_handler.invalidate_user_cache(med.user_id)
                 # Success message similar to conversation handler
                 status_msg = ""
                 if final_count <= med.low_stock_threshold:
@@ -1489,6 +1572,7 @@ class MedicineReminderBot:
                 await DatabaseManager.replace_medicine_schedules(medicine_id, times)
                 # Re-schedule reminders for this time
                 user = await DatabaseManager.get_user_by_telegram_id(update.effective_user.id)
+                self._reports_handler.invalidate_user_cache(user.id)
                 await medicine_scheduler.cancel_medicine_reminders(user.id, medicine_id)
                 await medicine_scheduler.schedule_medicine_reminder(
                     user_id=user.id,
@@ -1530,6 +1614,7 @@ class MedicineReminderBot:
                     await DatabaseManager.replace_medicine_schedules(mid, new_times)
                     # Unschedule then reschedule
                     user = await DatabaseManager.get_user_by_telegram_id(update.effective_user.id)
+                    self._reports_handler.invalidate_user_cache(user.id)
                     await medicine_scheduler.cancel_medicine_reminders(user.id, mid)
                     for t in new_times:
                         await medicine_scheduler.schedule_medicine_reminder(
@@ -1545,6 +1630,7 @@ class MedicineReminderBot:
                     await medicine_scheduler.cancel_medicine_reminders(user.id, mid)
                     ok = await DatabaseManager.delete_medicine(mid)
                     if ok:
+                        self._reports_handler.invalidate_user_cache(user.id)
                         await update.message.reply_text(f"{config.EMOJIS['success']} התרופה נמחקה")
                     else:
                         await update.message.reply_text(f"{config.EMOJIS['error']} שגיאה במחיקה")
@@ -1555,6 +1641,7 @@ class MedicineReminderBot:
                 if lower.startswith("מינון "):
                     new_dosage = text.split(" ", 1)[1].strip()
                     await DatabaseManager.update_medicine(mid, dosage=new_dosage)
+                    await self._invalidate_reports(update.effective_user.id)
                     await update.message.reply_text(f"{config.EMOJIS['success']} המינון עודכן")
                     user_data.pop("editing_medicine_for", None)
                     await self.my_medicines_command(update, context)
@@ -1562,6 +1649,7 @@ class MedicineReminderBot:
                 if lower.startswith("הערות "):
                     new_notes = text.split(" ", 1)[1].strip()
                     await DatabaseManager.update_medicine(mid, notes=new_notes)
+                    await self._invalidate_reports(update.effective_user.id)
                     await update.message.reply_text(f"{config.EMOJIS['success']} ההערות עודכנו")
                     user_data.pop("editing_medicine_for", None)
                     await self.my_medicines_command(update, context)
@@ -1570,6 +1658,7 @@ class MedicineReminderBot:
                 # Otherwise treat as rename
                 if len(text.strip()) >= 2:
                     await DatabaseManager.update_medicine(mid, name=text.strip())
+                    await self._invalidate_reports(update.effective_user.id)
                     await update.message.reply_text(f"{config.EMOJIS['success']} שם התרופה עודכן")
                     user_data.pop("editing_medicine_for", None)
                     await self.my_medicines_command(update, context)
@@ -1640,6 +1729,7 @@ class MedicineReminderBot:
                             symptoms=entry_text,
                             medicine_id=int(med_id) if med_id else None,
                         )
+                        self._reports_handler.invalidate_user_cache(user.id)
                         user_data.pop("awaiting_symptom_text", None)
                         user_data.pop("symptoms_for_medicine", None)
                         from utils.keyboards import get_main_menu_keyboard
@@ -1666,6 +1756,7 @@ class MedicineReminderBot:
                         return
                     user = await DatabaseManager.get_user_by_telegram_id(update.effective_user.id)
                     await DatabaseManager.update_user_timezone(user.id, normalized)
+                    self._reports_handler.forget_db_user(update.effective_user.id)
                     user_data.pop("awaiting_timezone_text", None)
                     await update.message.reply_text(f"{config.EMOJIS['success']} עודכן אזור הזמן ל- {display}")
                     return
@@ -1673,6 +1764,7 @@ class MedicineReminderBot:
                 if user_data.get("editing_symptom_log"):
                     log_id = int(user_data.get("editing_symptom_log"))
                     await DatabaseManager.update_symptom_log(log_id, symptoms=text)
+                    await self._invalidate_reports(update.effective_user.id)
                     user_data.pop("editing_symptom_log", None)
                     await update.message.reply_text(f"{config.EMOJIS['success']} הרישום עודכן")
                     return
@@ -1791,10 +1883,15 @@ class MedicineReminderBot:
             await self.application.initialize()
             await self.application.start()
 
-            # Configure webhook at Telegram side with secret token
+            # Configure webhook at Telegram side with secret token; the round trip overlaps the local server start-up below
             secret_token = config.BOT_TOKEN[-32:] if len(config.BOT_TOKEN) >= 32 else None
-            await self.application.bot.set_webhook(
-                url=webhook_url, allowed_updates=["message", "callback_query"], secret_token=secret_token
+            set_webhook_task = asyncio.create_task(
+                self.application.bot.set_webhook(
+                    url=webhook_url,
+                    allowed_updates=["message", "callback_query"],
+                    secret_token=secret_token,
+                    max_connections=config.WEBHOOK_MAX_CONNECTIONS,
+                )
             )
 
             # Build aiohttp app with /health and webhook handlers
@@ -1806,21 +1903,32 @@ class MedicineReminderBot:
             async def root_handler(request):
                 return web.Response(text="OK", content_type="text/plain")
 
+            # Encoded once; requests are checked with a constant-time comparison
+            expected_secret = secret_token.encode() if secret_token else None
+
             async def telegram_webhook_handler(request):
                 # Optional secret token validation
-                if secret_token:
-                    received = request.headers.get("X-Telegram-Bot-Api-Secret-Token")
-                    if received != secret_token:
+                if expected_secret:
+                    received = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+                    if not hmac.compare_digest(received.encode(), expected_secret):
                         return web.Response(status=401, text="Invalid secret token")
+                # Oversized bodies are rejected by aiohttp (413, client_max_size) before parsing
                 try:
-                    data = await request.json()
-                except Exception:
+                    data = _json_loads(await request.read())
+                except ValueError:
                     return web.Response(status=400, text="Invalid JSON")
+                # Acknowledge right away; the application's update fetcher runs the handlers.
+                # A non-2xx reply makes Telegram redeliver, so refuse updates that would not be processed.
+                if not self.application.running:
+                    return web.Response(status=503, text="Shutting down")
+                # The fetcher drains the queue into tasks right away, so count the work those tasks still hold
+                queue = self.application.update_queue
+                if self._update_processor.pending_updates + queue.qsize() >= _MAX_PENDING_UPDATES:
+                    return web.Response(status=503, text="Busy")
                 try:
-                    update = Update.de_json(data, self.application.bot)
-                    await self.application.process_update(update)
+                    queue.put_nowait(Update.de_json(data, self.application.bot))
                 except Exception as exc:
-                    logger.error(f"Failed to process update: {exc}")
+                    logger.error(f"Failed to queue update: {exc}")
                     return web.Response(status=500, text="Failed to process update")
                 return web.Response(text="OK")
 
@@ -1829,17 +1937,25 @@ class MedicineReminderBot:
             app.router.add_get("/", root_handler)
             app.router.add_post(config.WEBHOOK_PATH, telegram_webhook_handler)
 
-            runner = web.AppRunner(app)
+            # No per-request access log: Telegram posts to the same endpoint all day, and failures are logged by the handler
+            runner = web.AppRunner(app, access_log=None)
             self._runner = runner
-            await runner.setup()
-            site = web.TCPSite(runner, host="0.0.0.0", port=config.WEBHOOK_PORT)
-            await site.start()
-
-            logger.info("Webhook server is up")
-
-            # Wait until shutdown is requested
-            self._serve_forever_event = asyncio.Event()
             try:
+                try:
+                    await runner.setup()
+                    site = web.TCPSite(runner, host="0.0.0.0", port=config.WEBHOOK_PORT, backlog=512)
+                    await site.start()
+                except BaseException:
+                    # Report the server error, not the registration still in flight
+                    set_webhook_task.cancel()
+                    await asyncio.gather(set_webhook_task, return_exceptions=True)
+                    raise
+                # Surface a failed registration (or wait for it) before declaring the server up
+                await set_webhook_task
+
+                logger.info("Webhook server is up")
+
+                # Wait until shutdown is requested
                 await self._serve_forever_event.wait()
             except asyncio.CancelledError:
                 logger.debug("Webhook run cancelled - shutting down")
@@ -1883,11 +1999,7 @@ class MedicineReminderBot:
         self._shutdown_started = True
 
         # Signal the webhook runner (if any) to stop blocking
-        try:
-            if self._serve_forever_event and not self._serve_forever_event.is_set():
-                self._serve_forever_event.set()
-        except Exception:
-            pass
+        self._serve_forever_event.set()
 
         try:
             # Stop scheduler
@@ -1950,5 +2062,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    # Entry point for the application
-    asyncio.run(main())
+    # Entry point for the application; run on uvloop's faster event loop when it is installed
+    try:
+        from uvloop import new_event_loop as _loop_factory
+    except ImportError:
+        _loop_factory = None
+    with asyncio.Runner(loop_factory=_loop_factory) as runner:
+        runner.run(main())
@@ -363,6 +363,9 @@ class MedicineScheduler:
         """Mark a dose as missed in the database"""
         try:
             await DatabaseManager.log_dose_missed(medicine_id, datetime.utcnow())
+            from handlers.reports_handler import reports_handler
+
+            reports_handler.invalidate_user_cache(user_id)
         except Exception as e:
             logger.error(f"Failed to mark dose as missed: {e}")
 
@@ -0,0 +1,70 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# Disable config validation during tests
+os.environ.setdefault("DISABLE_CONFIG_VALIDATION", "1")
+
+import database
+from database import DatabaseManager
+
+
+@pytest_asyncio.fixture
+async def sqlite_db(tmp_path, monkeypatch):
+    """Point the SQLite backend at a fresh database file for one test."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "async_session", async_sessionmaker(engine, expire_on_commit=False))
+    await database.init_database()
+    yield
+    await engine.dispose()
+
+
+async def _medicine_with_stock(count):
+    user = await DatabaseManager.create_user(telegram_id=5, username="u", first_name="Test")
+    medicine = await DatabaseManager.create_medicine(user_id=user.id, name="Aspirin", dosage="1")
+    await DatabaseManager.update_inventory(medicine.id, count)
+    return user, medicine
+
+
+@pytest.mark.asyncio
+async def test_record_dose_taken_logs_dose_and_uses_stock(sqlite_db):
+    user, medicine = await _medicine_with_stock(2)
+    now = datetime.utcnow()
+
+    assert await DatabaseManager.record_dose_taken(medicine.id, now) == (user.id, 1)
+    assert await DatabaseManager.record_dose_taken(medicine.id, now) == (user.id, 0)
+    # Stock never goes negative, but the dose is still logged
+    assert await DatabaseManager.record_dose_taken(medicine.id, now) == (user.id, 0)
+
+    doses = await DatabaseManager.get_user_doses_in_range(user.id, now.date(), now.date())
+    assert [dose.status for dose in doses] == ["taken"] * 3
+    assert (await DatabaseManager.get_medicine_by_id(medicine.id)).inventory_count == 0
+
+
+@pytest.mark.asyncio
+async def test_record_dose_taken_unknown_medicine(sqlite_db):
+    assert await DatabaseManager.record_dose_taken(9999, datetime.utcnow()) is None
+
+
+@pytest.mark.asyncio
+async def test_get_user_doses_in_range_filters_dates_and_status(sqlite_db):
+    user, medicine = await _medicine_with_stock(10)
+    today = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+    await DatabaseManager.record_dose_taken(medicine.id, today)
+    await DatabaseManager.log_dose_skipped(medicine.id, today)
+    await DatabaseManager.record_dose_taken(medicine.id, today - timedelta(days=3))
+
+    # A dose counts when it was scheduled or logged within the range
+    in_range = await DatabaseManager.get_user_doses_in_range(user.id, today.date(), today.date())
+    assert sorted(dose.status for dose in in_range) == ["skipped", "taken", "taken"]
+    earlier = (today - timedelta(days=3)).date()
+    assert len(await DatabaseManager.get_user_doses_in_range(user.id, earlier, earlier)) == 1
+    before = earlier - timedelta(days=1)
+    assert await DatabaseManager.get_user_doses_in_range(user.id, before - timedelta(days=5), before) == []
+    taken = await DatabaseManager.get_user_doses_in_range(user.id, today.date(), today.date(), "taken")
+    assert len(taken) == 2
+    assert await DatabaseManager.get_user_doses_in_range(user.id + 1, today.date(), today.date()) == []
@@ -402,6 +402,18 @@ class TestCacheUtilities:
         cache.clear()
         assert cache.get("key4") == None
 
+    def test_simple_cache_evicts_least_recently_used(self):
+        """A size-capped SimpleCache drops the entry used longest ago"""
+        cache = SimpleCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # "b" is now the least recently used
+        cache.set("c", 3)
+
+        assert cache.get("b") == None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
 
 class TestGroupByDate:
     """Test group_by_date function with mock objects"""
@@ -0,0 +1,139 @@
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+# Disable config validation during tests
+os.environ.setdefault("DISABLE_CONFIG_VALIDATION", "1")
+
+from main import _PerUserUpdateProcessor
+
+
+def _update(user_id):
+    return SimpleNamespace(effective_user=SimpleNamespace(id=user_id) if user_id is not None else None)
+
+
+@pytest.mark.asyncio
+async def test_busy_user_does_not_block_other_users():
+    processor = _PerUserUpdateProcessor(4)
+    started = time.monotonic()
+    finished = {}
+
+    async def work(user_id, seconds):
+        await asyncio.sleep(seconds)
+        finished.setdefault(user_id, []).append(time.monotonic() - started)
+
+    tasks = [asyncio.create_task(processor.process_update(_update(1), work(1, 0.2))) for _ in range(6)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(processor.process_update(_update(2), work(2, 0.01))))
+    await asyncio.gather(*tasks)
+
+    assert finished[2][0] < 0.15
+    assert len(finished[1]) == 6
+
+
+@pytest.mark.asyncio
+async def test_updates_from_same_user_run_in_order():
+    processor = _PerUserUpdateProcessor(4)
+    order = []
+
+    async def work(n):
+        await asyncio.sleep(0.01 if n == 0 else 0)
+        order.append(n)
+
+    await asyncio.gather(*(processor.process_update(_update(1), work(n)) for n in range(3)))
+
+    assert order == [0, 1, 2]
+    assert not processor._user_locks
+
+
+@pytest.mark.asyncio
+async def test_concurrency_capped_across_users():
+    processor = _PerUserUpdateProcessor(2)
+    running = 0
+    peak = 0
+
+    async def work():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    await asyncio.gather(*(processor.process_update(_update(user_id), work()) for user_id in (1, 2, 3, None, None)))
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_pending_updates_counts_waiting_and_running_work():
+    processor = _PerUserUpdateProcessor(1)
+    release = asyncio.Event()
+
+    tasks = [asyncio.create_task(processor.process_update(_update(user_id), release.wait())) for user_id in (1, 1, 2)]
+    await asyncio.sleep(0)
+    assert processor.pending_updates == 3
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert processor.pending_updates == 0
+
+
+@pytest.mark.asyncio
+async def test_run_webhook_closes_server_when_registration_fails(monkeypatch):
+    from config import config
+    from main import MedicineReminderBot
+
+    async def noop():
+        pass
+
+    async def failing_set_webhook(**kwargs):
+        raise RuntimeError("set_webhook failed")
+
+    monkeypatch.setattr(config, "get_webhook_url", lambda: "https://example.invalid/webhook")
+    monkeypatch.setattr(config, "WEBHOOK_PORT", 0)
+    bot = MedicineReminderBot()
+    bot.application = SimpleNamespace(initialize=noop, start=noop, bot=SimpleNamespace(set_webhook=failing_set_webhook))
+
+    with pytest.raises(RuntimeError, match="set_webhook failed"):
+        await bot.run_webhook()
+
+    assert bot._runner.server is None
+    assert not bot._runner.sites
+
+
+@pytest.mark.asyncio
+async def test_safe_handler_logs_traceback_and_replies(caplog):
+    from main import _safe_handler
+
+    replies = []
+
+    async def reply_text(text):
+        replies.append(text)
+
+    @_safe_handler
+    async def broken_command(self, update, context):
+        raise ValueError("boom")
+
+    update = SimpleNamespace(effective_message=SimpleNamespace(reply_text=reply_text))
+    await broken_command(None, update, None)
+
+    assert len(replies) == 1
+    record = next(r for r in caplog.records if "broken_command" in r.getMessage())
+    assert record.exc_info and record.exc_info[0] is ValueError
+
+
+@pytest.mark.asyncio
+async def test_safe_handler_without_message_does_not_mask_error(caplog):
+    from main import _safe_handler
+
+    @_safe_handler
+    async def broken_command(self, update, context):
+        raise ValueError("boom")
+
+    await broken_command(None, SimpleNamespace(effective_message=None), None)
+    await broken_command(None, None, None)
+
+    assert [r.exc_info[0] for r in caplog.records if "broken_command" in r.getMessage()] == [ValueError, ValueError]
@@ -0,0 +1,686 @@
+import asyncio
+import os
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from telegram.ext import ConversationHandler
+
+# Disable config validation during tests
+os.environ.setdefault("DISABLE_CONFIG_VALIDATION", "1")
+
+from handlers.reports_handler import ReportsHandler, _CUSTOM_REPORT_PATTERN, _clamp_report_start, _split_entry_counts
+
+
+class StubMedicine:
+    def __init__(self, id_: int, name: str = "TestMed", inventory_count: float = 30, low_stock_threshold: float = 5):
+        self.id = id_
+        self.name = name
+        self.inventory_count = inventory_count
+        self.low_stock_threshold = low_stock_threshold
+        self.is_active = True
+
+
+class StubSchedule:
+    def __init__(self, is_active: bool = True):
+        self.is_active = is_active
+
+
+class StubDose:
+    def __init__(self, status: str, scheduled_time: datetime = None, created_at: datetime = None):
+        self.status = status
+        self.scheduled_time = scheduled_time
+        self.created_at = created_at
+
+
+@pytest.fixture
+def stub_db(monkeypatch):
+    """Patch DatabaseManager with in-memory stubs and count calls per method."""
+    calls = {}
+    medicines = [StubMedicine(1, "Aspirin"), StubMedicine(2, "Vitamin D", inventory_count=2)]
+
+    def track(name):
+        calls[name] = calls.get(name, 0) + 1
+
+    async def fake_get_user_medicines(user_id, active_only=True):
+        track("get_user_medicines")
+        return medicines
+
+    async def fake_get_medicine_doses_in_range(medicine_id, start_date, end_date):
+        track("get_medicine_doses_in_range")
+        return [StubDose("taken"), StubDose("taken"), StubDose("skipped")]
+
+    async def fake_get_dose_status_counts(user_id, start_date, end_date):
+        track("get_dose_status_counts")
+        return {m.id: {"taken": 2, "skipped": 1} for m in medicines}
+
+    async def fake_get_medicine_schedules(medicine_id):
+        track("get_medicine_schedules")
+        return [StubSchedule()]
+
+    async def fake_get_symptom_summary(user_id, start_date, end_date):
+        track("get_symptom_summary")
+        return {"log_count": 0, "mood_scores": [], "symptoms": {}, "side_effects": {}}
+
+    async def fake_get_user_doses_in_range(user_id, start_date, end_date, status=None):
+        track("get_user_doses_in_range")
+        return [StubDose("taken", scheduled_time=datetime.combine(start_date, time(8)))]
+
+    monkeypatch.setattr("database.DatabaseManager.get_user_medicines", fake_get_user_medicines)
+    monkeypatch.setattr("database.DatabaseManager.get_medicine_doses_in_range", fake_get_medicine_doses_in_range)
+    monkeypatch.setattr("database.DatabaseManager.get_dose_status_counts", fake_get_dose_status_counts)
+    monkeypatch.setattr("database.DatabaseManager.get_medicine_schedules", fake_get_medicine_schedules)
+    monkeypatch.setattr("database.DatabaseManager.get_symptom_summary", fake_get_symptom_summary)
+    monkeypatch.setattr("database.DatabaseManager.get_user_doses_in_range", fake_get_user_doses_in_range)
+    return calls
+
+
+class StubMessage:
+    def __init__(self):
+        self.replies = []
+        self.edits = []
+        self.documents = []
+
+    async def reply_text(self, text, parse_mode=None, reply_markup=None):
+        self.replies.append(text)
+        return self
+
+    async def edit_text(self, text, parse_mode=None, reply_markup=None):
+        self.edits.append(text)
+        return self
+
+    async def reply_document(self, document, filename=None, caption=None, parse_mode=None, reply_markup=None):
+        self.documents.append({"document": document, "filename": filename, "caption": caption})
+        return self
+
+
+class StubUpdate:
+    def __init__(self, telegram_id: int = 5):
+        self.effective_user = StubUser(telegram_id)
+        self.message = StubMessage()
+        self.callback_query = None
+
+
+@pytest.mark.asyncio
+async def test_full_report_fetches_medicines_once_for_shared_sections(stub_db):
+    """Adherence and inventory sections should share one medicines fetch."""
+    handler = ReportsHandler()
+    end_date = date.today()
+    start_date = end_date - timedelta(days=2)
+
+    await handler._generate_adherence_report(1, start_date, end_date, medicines=[StubMedicine(1)])
+    await handler._generate_inventory_report(1, medicines=[StubMedicine(1)])
+    assert stub_db.get("get_user_medicines", 0) == 0
+
+    stub_db.clear()
+    report = await handler._generate_full_report(1, start_date, end_date)
+    assert "Aspirin" in report
+    assert "Vitamin D" in report
+    assert stub_db["get_user_medicines"] == 1
+    # Adherence and trends share one schedule load: one read per medicine
+    assert stub_db["get_medicine_schedules"] == 2
+
+
+@pytest.mark.asyncio
+async def test_report_inputs_cached_until_invalidated(stub_db):
+    """Repeated reports reuse cached inputs; invalidation forces a fresh read."""
+    handler = ReportsHandler()
+    end_date = date.today()
+    start_date = end_date - timedelta(days=2)
+
+    first = await handler._calculate_daily_adherence(1, start_date, end_date)
+    await handler._calculate_daily_adherence(1, start_date, end_date)
+    assert stub_db["get_user_doses_in_range"] == 1
+    assert stub_db["get_user_medicines"] == 1
+
+    handler.invalidate_user_cache(1)
+    second = await handler._calculate_daily_adherence(1, start_date, end_date)
+    assert stub_db["get_user_doses_in_range"] == 2
+    assert stub_db["get_user_medicines"] == 2
+    assert first == second
+    assert first == {start_date: 50.0, start_date + timedelta(days=1): 0, end_date: 0}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_report_inputs_share_one_load(stub_db, monkeypatch):
+    """Concurrent requests for the same inputs await a single in-flight load."""
+    medicines = [StubMedicine(1)]
+
+    async def slow_get_user_medicines(user_id, active_only=True):
+        stub_db["get_user_medicines"] = stub_db.get("get_user_medicines", 0) + 1
+        await asyncio.sleep(0)
+        return medicines
+
+    monkeypatch.setattr("database.DatabaseManager.get_user_medicines", slow_get_user_medicines)
+    handler = ReportsHandler()
+    end_date = date.today()
+    start_date = end_date - timedelta(days=2)
+
+    first, second = await asyncio.gather(handler._get_user_medicines(1), handler._get_user_medicines(1))
+    assert first is second is medicines
+    assert stub_db["get_user_medicines"] == 1
+
+    handler.invalidate_user_cache(1)
+    rates = await asyncio.gather(*(handler._calculate_daily_adherence(1, start_date, end_date) for _ in range(3)))
+    assert rates[0] == rates[1] == rates[2]
+    assert stub_db["get_user_doses_in_range"] == 1
+    assert handler._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_rendered_report_reused_for_same_end_date():
+    """Rendered report bodies are reused for the same end date and rebuilt after invalidation."""
+    handler = ReportsHandler()
+    builds = []
+
+    async def build():
+        builds.append(1)
+        return f"body {len(builds)}"
+
+    today = date.today()
+    assert await handler._get_cached_report(1, "weekly", today, build) == "body 1"
+    assert await handler._get_cached_report(1, "weekly", today, build) == "body 1"
+    assert await handler._get_cached_report(1, "weekly", today + timedelta(days=1), build) == "body 2"
+
+    handler.invalidate_user_cache(1)
+    assert await handler._get_cached_report(1, "weekly", today + timedelta(days=1), build) == "body 3"
+
+
+@pytest.mark.asyncio
+async def test_inventory_report_reused_until_stock_changes(monkeypatch):
+    """The inventory section is re-rendered only when a medicine's stock snapshot changes."""
+    handler = ReportsHandler()
+    medicines = [StubMedicine(1, "Aspirin", inventory_count=30)]
+
+    first = await handler._generate_inventory_report(1, medicines=medicines)
+    assert await handler._generate_inventory_report(1, medicines=medicines) is first
+
+    medicines[0].inventory_count = 0
+    second = await handler._generate_inventory_report(1, medicines=medicines)
+    assert second is not first and "Aspirin" in second
+
+
+@pytest.mark.asyncio
+async def test_inventory_report_treats_missing_stock_as_empty():
+    """A medicine without a recorded inventory count is bucketed as out of stock rather than erroring."""
+    handler = ReportsHandler()
+    report = await handler._generate_inventory_report(1, medicines=[StubMedicine(1, "Aspirin", inventory_count=None)])
+    assert "נגמר: 1" in report
+
+
+@pytest.mark.asyncio
+async def test_adherence_report_counts_statuses(stub_db):
+    """Taken/skipped/missed totals are derived from a single pass over the doses."""
+    handler = ReportsHandler()
+    end_date = date.today()
+    start_date = end_date - timedelta(days=2)
+
+    # 2 medicines x 1 schedule x 3 days = 6 planned; each medicine has 2 taken + 1 skipped
+    report = await handler._generate_adherence_report(1, start_date, end_date)
+    assert 'סה"כ מנות מתוכננות: 6' in report
+    assert "מנות שנלקחו: 4" in report
+    assert "מנות שדולגו: 2" in report
+    assert "מנות שהוחמצו: 0" in report
+    assert stub_db["get_dose_status_counts"] == 1
+    assert "get_medicine_doses_in_range" not in stub_db
+
+
+@pytest.mark.asyncio
+async def test_symptoms_report_summary(monkeypatch):
+    """Mood average, day counts and most common items come from the aggregated summary."""
+
+    async def fake_get_symptom_summary(user_id, start_date, end_date):
+        return {
+            "log_count": 3,
+            "mood_scores": [6, 8],
+            "symptoms": {"כאב ראש, עייפות": 1, "כאב ראש": 1},
+            "side_effects": {"בחילה": 2},
+        }
+
+    monkeypatch.setattr("database.DatabaseManager.get_symptom_summary", fake_get_symptom_summary)
+    report = await ReportsHandler()._generate_symptoms_report(1, date.today(), date.today())
+
+    assert "ימים עם רישומים: 3" in report
+    assert "ממוצע מצב רוח: 7.0/10" in report
+    assert "ימים עם תסמינים: 2" in report
+    assert "ימים עם תופעות לוואי: 2" in report
+    assert "כאב ראש: 2 פעמים" in report
+    assert "בחילה: 2 פעמים" in report
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "moods, trend",
+    [
+        ([5, 5, 5, 6, 6, 6], "עולה"),
+        ([6, 6, 6, 5, 5, 5], "מתדרדרת"),
+        ([4, 4, 4, 6, 6, 6], "עולה"),
+        ([5, 5, 5, 5.4], "יציבה"),
+        ([5, 5, 5, 4.6], "יציבה"),
+    ],
+)
+async def test_symptoms_report_mood_trend(monkeypatch, moods, trend):
+    """Mood trend compares early and recent averages on the 1-10 scale."""
+
+    async def fake_get_symptom_summary(user_id, start_date, end_date):
+        return {"log_count": len(moods), "mood_scores": moods, "symptoms": {}, "side_effects": {}}
+
+    monkeypatch.setattr("database.DatabaseManager.get_symptom_summary", fake_get_symptom_summary)
+    report = await ReportsHandler()._generate_symptoms_report(1, date.today(), date.today())
+    assert f"מגמת מצב רוח:** {trend}" in report
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("distinct_entries, offloaded", [(3, False), (200, True)])
+async def test_symptoms_report_offloads_only_large_summaries(monkeypatch, distinct_entries, offloaded):
+    """Small summaries are rendered inline; only large ones pay for the worker thread hand-off."""
+    threaded = []
+
+    async def fake_get_symptom_summary(user_id, start_date, end_date):
+        symptoms = {f"symptom {i}": 1 for i in range(distinct_entries)}
+        return {"log_count": distinct_entries, "mood_scores": [], "symptoms": symptoms, "side_effects": {}}
+
+    async def fake_to_thread(func, *args):
+        threaded.append(func)
+        return func(*args)
+
+    monkeypatch.setattr("database.DatabaseManager.get_symptom_summary", fake_get_symptom_summary)
+    monkeypatch.setattr(asyncio, "to_thread", fake_to_thread)
+    report = await ReportsHandler()._generate_symptoms_report(1, date.today(), date.today())
+
+    assert "symptom 0" in report
+    assert bool(threaded) is offloaded
+
+
+class StubCaregiver:
+    def __init__(self, id_: int, telegram_id, permissions: str = "view"):
+        self.id = id_
+        self.caregiver_telegram_id = telegram_id
+        self.permissions = permissions
+        self.is_active = True
+
+
+class StubUser:
+    def __init__(self, id_: int, first_name: str = "Dana", last_name: str = None):
+        self.id = id_
+        self.first_name = first_name
+        self.last_name = last_name
+
+
+class StubSentMessage:
+    def __init__(self, message_id: int):
+        self.message_id = message_id
+
+
+class StubBot:
+    def __init__(self):
+        self.sent = []
+        self.copied = []
+
+    async def send_message(self, chat_id: int, text: str, parse_mode: str = None, reply_markup=None):
+        self.sent.append({"chat_id": chat_id, "text": text})
+        return StubSentMessage(len(self.sent))
+
+    async def copy_message(self, chat_id: int, from_chat_id: int, message_id: int):
+        self.copied.append({"chat_id": chat_id, "from_chat_id": from_chat_id, "message_id": message_id})
+
+
+@pytest.mark.asyncio
+async def test_send_report_to_caregivers_uses_given_bot(monkeypatch):
+    """Reports go to every caregiver with a Telegram id through the injected bot."""
+    caregivers = [
+        StubCaregiver(1, 111),
+        StubCaregiver(2, None),
+        StubCaregiver(3, 333, permissions="manage"),
+        StubCaregiver(4, 444, permissions="none"),
+    ]
+
+    async def fake_get_user_caregivers(user_id, active_only=True, permissions=None):
+        # Permission filtering happens in the query, not in the handler
+        return [c for c in caregivers if permissions is None or c.permissions in permissions]
+
+    async def fake_get_user_by_id(user_id):
+        return StubUser(user_id)
+
+    monkeypatch.setattr("database.DatabaseManager.get_user_caregivers", fake_get_user_caregivers)
+    monkeypatch.setattr("database.DatabaseManager.get_user_by_id", fake_get_user_by_id)
+
+    bot = StubBot()
+    await ReportsHandler()._send_report_to_caregivers(7, "דוח שבועי", "content", bot)
+
+    assert sorted(m["chat_id"] for m in bot.sent) == [111, 333]
+    assert all("Dana" in m["text"] and "content" in m["text"] for m in bot.sent)
+
+
+@pytest.mark.asyncio
+async def test_send_report_to_caregivers_copies_from_relay_chat(monkeypatch):
+    """With a relay chat configured the report is uploaded once and copied to each caregiver."""
+    import config as config_module
+
+    async def fake_get_user_caregivers(user_id, active_only=True, permissions=None):
+        return [StubCaregiver(1, 111), StubCaregiver(2, 222)]
+
+    async def fake_get_user_by_id(user_id):
+        return StubUser(user_id)
+
+    monkeypatch.setattr("database.DatabaseManager.get_user_caregivers", fake_get_user_caregivers)
+    monkeypatch.setattr("database.DatabaseManager.get_user_by_id", fake_get_user_by_id)
+    monkeypatch.setattr(config_module.config, "RELAY_CHAT_ID", -100)
+
+    bot = StubBot()
+    await ReportsHandler()._send_report_to_caregivers(7, "דוח שבועי", "content", bot)
+
+    assert [m["chat_id"] for m in bot.sent] == [-100]
+    assert sorted(m["chat_id"] for m in bot.copied) == [111, 222]
+    assert all(m["from_chat_id"] == -100 and m["message_id"] == 1 for m in bot.copied)
+
+
+@pytest.mark.asyncio
+async def test_send_report_to_caregivers_reuses_given_user(monkeypatch):
+    """A caller that already holds the patient skips the user lookup."""
+
+    async def fake_get_user_caregivers(user_id, active_only=True, permissions=None):
+        return [StubCaregiver(1, 111)]
+
+    async def fail_get_user_by_id(user_id):
+        raise AssertionError("user should not be re-fetched")
+
+    monkeypatch.setattr("database.DatabaseManager.get_user_caregivers", fake_get_user_caregivers)
+    monkeypatch.setattr("database.DatabaseManager.get_user_by_id", fail_get_user_by_id)
+
+    bot = StubBot()
+    await ReportsHandler()._send_report_to_caregivers(7, "דוח שבועי", "content", bot, user=StubUser(7))
+
+    assert [m["chat_id"] for m in bot.sent] == [111]
+
+
+def test_combine_reports_skips_empty_sections():
+    """Empty or missing sections do not leave blank gaps between the others."""
+    assert ReportsHandler()._combine_reports(["a", "", None, "b"]) == "a\n\nb"
+    assert ReportsHandler()._combine_reports(iter(["only"])) == "only"
+
+
+@pytest.mark.asyncio
+async def test_gather_sections_keeps_partial_report_on_failure():
+    """A failing section is dropped while the others are still returned in order."""
+
+    async def ok(text):
+        return text
+
+    async def boom():
+        raise RuntimeError("db down")
+
+    sections = await ReportsHandler()._gather_sections(ok("a"), boom(), ok("c"))
+    assert sections == ["a", "", "c"]
+
+
+@pytest.mark.asyncio
+async def test_weekly_report_short_circuits_without_tracking_data(stub_db, monkeypatch):
+    """Users with no medicines or symptom logs get a canned reply and no report queries."""
+
+    async def fake_get_user_by_telegram_id(telegram_id):
+        return StubUser(1)
+
+    async def fake_user_has_any_tracking(user_id):
+        return False
+
+    monkeypatch.setattr("database.DatabaseManager.get_user_by_telegram_id", fake_get_user_by_telegram_id)
+    monkeypatch.setattr("database.DatabaseManager.user_has_any_tracking", fake_user_has_any_tracking)
+
+    update = StubUpdate()
+    await ReportsHandler().generate_weekly_report(update, context=None)
+
+    assert len(update.message.replies) == 1
+    assert "אין עדיין נתונים" in update.message.replies[0]
+    assert stub_db == {}
+
+
+class StubApplication:
+    def __init__(self):
+        self.tasks = []
+
+    def create_task(self, coroutine, update=None):
+        task = asyncio.create_task(coroutine)
+        self.tasks.append(task)
+        return task
+
+
+class StubContext:
+    def __init__(self):
+        self.user_data = {}
+        self.bot = None
+        self.application = StubApplication()
+
+
+@pytest.mark.asyncio
+async def test_get_db_user_reuses_recent_lookup(monkeypatch):
+    """The DB user is looked up once and reused until forgotten."""
+    lookups = []
+
+    async def fake_get_user_by_telegram_id(telegram_id):
+        lookups.append(telegram_id)
+        return StubUser(1)
+
+    monkeypatch.setattr("database.DatabaseManager.get_user_by_telegram_id", fake_get_user_by_telegram_id)
+    handler = ReportsHandler()
+
+    first = await handler.get_db_user(5)
+    second = await handler.get_db_user(5)
+    assert first is second
+    assert lookups == [5]
+
+    await handler.get_db_user(6)
+    assert lookups == [5, 6]
+
+    handler.forget_db_user(5)
+    await handler.get_db_user(5)
+    assert lookups == [5, 6, 5]
+
+
+class StubCallbackQuery:
+    def __init__(self, data: str):
+        self.data = data
+        self.message = StubMessage()
+        self.edits = []
+
+    async def answer(self):
+        return None
+
+    async def edit_message_text(self, text, parse_mode=None, reply_markup=None):
+        self.edits.append(text)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data", ["reports_advanced", "report_detailed"])
+async def test_start_custom_report_routes_advanced_menu(data):
+    """Menu-only callbacks are routed through the dispatch table without touching the DB."""
+    query = StubCallbackQuery(data)
+    state = await ReportsHandler().start_custom_report(query, StubContext())
+
+    assert state == ConversationHandler.END
+    assert len(query.message.replies) == 1 and "דוחות מתקדמים" in query.message.replies[0]
+
+
+@pytest.mark.asyncio
+async def test_start_custom_report_dispatches_single_section(stub_db, monkeypatch):
+    """Section callbacks look up their title and generator; unknown ones fall back to the menu without a DB read."""
+
+    async def fake_get_user_by_telegram_id(telegram_id):
+        return StubUser(1)
+
+    monkeypatch.setattr("database.DatabaseManager.get_user_by_telegram_id", fake_get_user_by_telegram_id)
+    handler = ReportsHandler()
+
+    update = StubUpdate()
+    update.callback_query = StubCallbackQuery("report_unknown")
+    await handler.start_custom_report(update, StubContext())
+    assert stub_db == {}
+    assert len(update.callback_query.edits) == 1
+
+    update = StubUpdate()
+    update.callback_query = StubCallbackQuery("report_symptoms")
+    context = StubContext()
+    await handler.start_custom_report(update, context)
+    assert stub_db == {"get_symptom_summary": 1}
+    assert context.user_data["last_report"]["title"] == "דוח תופעות לוואי (30 ימים)"
+
+
+@pytest.mark.parametrize(
+    "data, matches",
+    [("report_weekly", True), ("report_send_doctor", True), ("report_action_share", False), ("reports_menu", False)],
+)
+def test_custom_report_pattern_leaves_action_buttons_alone(data, matches):
+    assert bool(_CUSTOM_REPORT_PATTERN.match(data)) is matches
+
+
+@pytest.mark.asyncio
+async def test_share_action_uploads_report_from_memory(tmp_path, monkeypatch):
+    """Sharing sends the last report as in-memory bytes without writing a file."""
+    monkeypatch.chdir(tmp_path)
+    update = StubUpdate()
+    update.callback_query = StubCallbackQuery("report_action_share")
+    context = StubContext()
+    context.user_data["last_report"] = {"title": "דוח שבועי", "end": date(2024, 1, 7), "content": "תוכן הדוח"}
+
+    await ReportsHandler().handle_report_actions(update, context)
+
+    [sent] = update.callback_query.message.documents
+    assert sent["document"] == "תוכן הדוח".encode("utf-8")
+    assert sent["filename"].endswith(".txt")
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_export_sends_status_as_document_caption():
+    """Export makes a single upload with the status line as its caption instead of editing the message first."""
+    update = StubUpdate()
+    update.callback_query = StubCallbackQuery("export_report")
+    context = StubContext()
+    context.user_data["last_report"] = {"end": date(2024, 1, 7), "content": "תוכן הדוח"}
+
+    await ReportsHandler().export_report(update, context)
+
+    [sent] = update.callback_query.message.documents
+    assert sent["document"] == "תוכן הדוח".encode("utf-8")
+    assert "נשלח כקובץ מצורף" in sent["caption"]
+    assert update.callback_query.edits == []
+
+
+def test_split_entry_counts_tolerates_spacing():
+    counts, log_count = _split_entry_counts({"כאב ראש, בחילה": 2, "כאב ראש,בחילה , עייפות": 1, " עייפות ": 1})
+    assert counts == {"כאב ראש": 3, "בחילה": 3, "עייפות": 2}
+    assert log_count == 4
+
+
+@pytest.mark.parametrize("entry", ["a,b", "a , b", "a, b", "a,  b,", " a ,b , "])
+def test_split_entry_counts_separates_free_typed_items(entry):
+    counts, log_count = _split_entry_counts({entry: 2})
+    assert counts == {"a": 2, "b": 2}
+    assert log_count == 2
+
+
+@pytest.mark.parametrize("days_back, expected_days_back", [(7, 7), (30, 30), (90, 90), (365, 90)])
+def test_report_range_is_clamped(days_back, expected_days_back):
+    """Report sections never query more than the maximum window."""
+    end_date = date(2024, 6, 30)
+    assert _clamp_report_start(end_date - timedelta(days=days_back), end_date) == end_date - timedelta(days=expected_days_back)
+
+
+@pytest.mark.asyncio
+async def test_weekly_report_shows_first_section_while_loading(monkeypatch):
+    """The loading message is edited with the first finished section, then with the full report."""
+    handler = ReportsHandler()
+    symptoms_release = asyncio.Event()
+
+    async def fake_get_user_by_telegram_id(telegram_id):
+        return StubUser(1)
+
+    async def fake_user_has_any_tracking(user_id):
+        return True
+
+    async def fake_adherence(user_id, start_date, end_date, medicines=None):
+        return "ADHERENCE"
+
+    async def fake_symptoms(user_id, start_date, end_date):
+        await symptoms_release.wait()
+        return "SYMPTOMS"
+
+    async def fake_send_to_caregivers(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr("database.DatabaseManager.get_user_by_telegram_id", fake_get_user_by_telegram_id)
+    monkeypatch.setattr("database.DatabaseManager.user_has_any_tracking", fake_user_has_any_tracking)
+    monkeypatch.setattr(handler, "_generate_adherence_report", fake_adherence)
+    monkeypatch.setattr(handler, "_generate_symptoms_report", fake_symptoms)
+    monkeypatch.setattr(handler, "_send_report_to_caregivers", fake_send_to_caregivers)
+
+    update = StubUpdate()
+    task = asyncio.create_task(handler.generate_weekly_report(update, StubContext()))
+    for _ in range(20):
+        await asyncio.sleep(0)
+    assert update.message.edits and "ADHERENCE" in update.message.edits[0] and "SYMPTOMS" not in update.message.edits[0]
+
+    symptoms_release.set()
+    await task
+    assert "ADHERENCE" in update.message.edits[-1] and "SYMPTOMS" in update.message.edits[-1]
+
+
+@pytest.mark.asyncio
+async def test_weekly_report_does_not_wait_for_caregiver_delivery(monkeypatch):
+    """Caregiver delivery runs in the background after the user gets their report."""
+    handler = ReportsHandler()
+    delivery_release = asyncio.Event()
+    delivered = []
+
+    async def fake_get_user_by_telegram_id(telegram_id):
+        return StubUser(1)
+
+    async def fake_user_has_any_tracking(user_id):
+        return True
+
+    async def fake_section(*args, **kwargs):
+        return "SECTION"
+
+    async def fake_send_to_caregivers(user_id, report_title, report_content, bot=None, user=None):
+        await delivery_release.wait()
+        delivered.append(report_title)
+
+    monkeypatch.setattr("database.DatabaseManager.get_user_by_telegram_id", fake_get_user_by_telegram_id)
+    monkeypatch.setattr("database.DatabaseManager.user_has_any_tracking", fake_user_has_any_tracking)
+    monkeypatch.setattr(handler, "_generate_adherence_report", fake_section)
+    monkeypatch.setattr(handler, "_generate_symptoms_report", fake_section)
+    monkeypatch.setattr(handler, "_send_report_to_caregivers", fake_send_to_caregivers)
+
+    update = StubUpdate()
+    context = StubContext()
+    await asyncio.wait_for(handler.generate_weekly_report(update, context), timeout=1)
+    assert "SECTION" in update.message.edits[-1]
+    assert delivered == [] and len(context.application.tasks) == 1
+
+    delivery_release.set()
+    await asyncio.gather(*context.application.tasks)
+    assert delivered == ["דוח שבועי"]
+
+
+@pytest.mark.parametrize(
+    "score, emoji",
+    [(0, "😩"), (2, "😩"), (2.5, "😟"), (4, "😟"), (6, "😐"), (7.9, "😊"), (8, "😊"), (8.1, "😄"), (10, "😄")],
+)
+def test_get_mood_emoji_buckets(score, emoji):
+    """Bucket edges are inclusive upper bounds."""
+    assert ReportsHandler()._get_mood_emoji(score) == emoji
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("spread, label", [(0, "גבוהה"), (19.9, "גבוהה"), (20, "בינונית"), (39.9, "בינונית"), (40, "נמוכה")])
+async def test_trends_report_stability_label(monkeypatch, spread, label):
+    """Stability label is chosen from the best/worst daily adherence spread."""
+    handler = ReportsHandler()
+    start_date = date(2024, 1, 1)
+    rates = {start_date + timedelta(days=i): r for i, r in enumerate([50.0, 50.0 + spread, 50.0, 50.0])}
+
+    async def fake_daily(user_id, start, end):
+        return rates
+
+    monkeypatch.setattr(handler, "_calculate_daily_adherence", fake_daily)
+    report = await handler._generate_trends_report(1, start_date, start_date + timedelta(days=3))
+    assert f"יציבות: {label}" in report
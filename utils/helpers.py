@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import re
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, date, time, timedelta
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Callable, Awaitable, Set
 
@@ -162,7 +164,9 @@ def format_datetime_hebrew(dt: datetime) -> str:
     return f"{day_name}, {dt.day} {month_name} {dt.year} {dt.strftime('%H:%M')}"
 
 
+@lru_cache(maxsize=512)
 def format_date_hebrew(d: date) -> str:
+    # Report ranges end on today's date for every user, so the same few dates are formatted over and over
     day_name = _he_day_name(d)
     month_name = _HE_MONTHS[d.month - 1]
     return f"{day_name}, {d.day} {month_name} {d.year}"
@@ -347,6 +351,16 @@ def safe_str(value: Any, default: str = "") -> str:
     return str(value)
 
 
+_PROGRESS_BAR_CHARS = {"emoji": ("🟩", "⬜"), "shade": ("▓", "░"), "block": ("█", "░")}
+
+
+@lru_cache(maxsize=256)
+def _progress_bar_body(filled: int, width: int, style: str) -> str:
+    # Only width + 1 distinct bars exist per style, so they are built once and reused
+    fill_char, empty_char = _PROGRESS_BAR_CHARS.get(style, _PROGRESS_BAR_CHARS["block"])
+    return fill_char * filled + empty_char * (width - filled)
+
+
 def create_progress_bar(current: int, total: int, width: int = 10, style: str = "block") -> str:
     current = max(0, current)
     total = max(0, total)
@@ -357,19 +371,7 @@ def create_progress_bar(current: int, total: int, width: int = 10, style: str =
         percent = (current / total) * 100
         filled = int(round(width * current / float(total)))
 
-    # Choose characters based on style
-    if style == "emoji":
-        fill_char = "🟩"
-        empty_char = "⬜"
-    elif style == "shade":
-        fill_char = "▓"
-        empty_char = "░"
-    else:  # default "block"
-        fill_char = "█"
-        empty_char = "░"
-
-    bar = fill_char * filled + empty_char * (width - filled)
-    return f"[{bar}] {percent:.1f}%"
+    return f"[{_progress_bar_body(filled, width, style)}] {percent:.1f}%"
 
 
 # ===============================
@@ -384,9 +386,12 @@ class _CacheItem:
 
 
 class SimpleCache:
-    def __init__(self, default_ttl: Optional[int] = None):
-        self._store: Dict[str, _CacheItem] = {}
+    """In-memory cache with optional expiry; with ``max_size`` the least recently used entries are evicted."""
+
+    def __init__(self, default_ttl: Optional[int] = None, max_size: Optional[int] = None):
+        self._store: "OrderedDict[str, _CacheItem]" = OrderedDict()
         self._default_ttl = default_ttl
+        self._max_size = max_size
 
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         expires_at = None
@@ -394,6 +399,10 @@ class SimpleCache:
         if ttl is not None and ttl > 0:
             expires_at = datetime.now() + timedelta(seconds=ttl)
         self._store[key] = _CacheItem(value=value, expires_at=expires_at)
+        if self._max_size is not None:
+            self._store.move_to_end(key)
+            while len(self._store) > self._max_size:
+                self._store.popitem(last=False)
 
     def get(self, key: str) -> Optional[Any]:
         item = self._store.get(key)
@@ -402,6 +411,8 @@ class SimpleCache:
         if item.expires_at and datetime.now() >= item.expires_at:
             del self._store[key]
             return None
+        if self._max_size is not None:
+            self._store.move_to_end(key)
         return item.value
 
     def remove(self, key: str) -> bool:
@@ -3,12 +3,16 @@ Keyboard layouts and inline buttons for Medicine Reminder Bot
 Designed for elderly users with large, clear buttons and Hebrew text
 """
 
+from functools import lru_cache
 from typing import List, Optional
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
 
 from config import config
 
+# Keyboards that take no arguments never change and PTB markups are immutable, so each one is built once and shared
 
+
+@lru_cache(maxsize=None)
 def get_main_menu_keyboard() -> ReplyKeyboardMarkup:
     """Main menu keyboard with large, clear buttons"""
     keyboard = [
@@ -27,6 +31,7 @@ def get_main_menu_keyboard() -> ReplyKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=None)
 def get_appointments_menu_keyboard() -> InlineKeyboardMarkup:
     """Inline menu for creating an appointment"""
     keyboard = [
@@ -235,6 +240,7 @@ def get_medicine_detail_keyboard(medicine_id: int, is_active: bool = True) -> In
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_settings_keyboard() -> InlineKeyboardMarkup:
     """Settings menu keyboard"""
     keyboard = [
@@ -272,6 +278,7 @@ def get_reminders_settings_keyboard(current_snooze: int, current_attempts: int,
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_inventory_main_keyboard() -> InlineKeyboardMarkup:
     """Keyboard for inventory main section."""
     keyboard = [
@@ -284,6 +291,7 @@ def get_inventory_main_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_caregiver_keyboard() -> InlineKeyboardMarkup:
     """Caregiver management keyboard"""
     keyboard = [
@@ -297,6 +305,7 @@ def get_caregiver_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_symptoms_keyboard() -> InlineKeyboardMarkup:
     """Symptoms tracking keyboard"""
     keyboard = [
@@ -308,6 +317,7 @@ def get_symptoms_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_reports_keyboard() -> InlineKeyboardMarkup:
     """Reports menu keyboard"""
     keyboard = [
@@ -326,6 +336,7 @@ def get_reports_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_time_selection_keyboard() -> InlineKeyboardMarkup:
     """Time selection keyboard for scheduling"""
     keyboard = []
@@ -423,6 +434,7 @@ def get_confirmation_keyboard(action: str, item_id: int = None) -> InlineKeyboar
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_cancel_keyboard() -> InlineKeyboardMarkup:
     """Simple cancel button"""
     keyboard = [[InlineKeyboardButton(f"{config.EMOJIS['back']} חזור", callback_data="cancel")]]
@@ -484,6 +496,7 @@ def hide_keyboard() -> ReplyKeyboardMarkup:
 
 
 # Emergency contact keyboard
+@lru_cache(maxsize=None)
 def get_emergency_keyboard() -> InlineKeyboardMarkup:
     """Emergency actions keyboard"""
     keyboard = [